@@ -4,71 +4,129 @@ PROJECT FLUME - Create Gold Layer (Enhanced with Hydrometric Data)
 Aggregated tables optimized for dashboard queries
 """
 import pandas as pd
-import boto3
-import io
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import pyarrow
+import pyarrow.compute as pc
+import pyarrow.dataset
+import pyarrow.fs
+import pyarrow.parquet as pq
 
 S3_BUCKET = "project-nimbus-raw-data-lake-12345-raj"
-s3_client = boto3.client('s3')
+AWS_REGION = "us-east-1"
 
-def read_all_parquet(prefix):
-    """Read all Parquet files from S3 prefix into single DataFrame"""
+# Arrow's native S3 client issues range reads in parallel on its own IO
+# thread pool, so silver reads don't bottleneck on one-GET-at-a-time Python
+pyarrow.set_io_thread_count(16)
+s3_fs = pyarrow.fs.S3FileSystem(region=AWS_REGION)
+
+# pre_buffer coalesces the column-chunk reads of each file into a few large
+# async range requests, which matters on high-latency S3
+parquet_format = pyarrow.dataset.ParquetFileFormat(
+    default_fragment_scan_options=pyarrow.dataset.ParquetFragmentScanOptions(pre_buffer=True)
+)
+
+def read_all_parquet_table(prefix):
+    """Read all Parquet files from S3 prefix into a single Arrow table"""
     print(f"Reading files from {prefix}...")
-    
-    # List all parquet files
-    paginator = s3_client.get_paginator('list_objects_v2')
-    files = []
-    for page in paginator.paginate(Bucket=S3_BUCKET, Prefix=prefix):
-        if 'Contents' in page:
-            files.extend([obj['Key'] for obj in page['Contents'] if obj['Key'].endswith('.parquet')])
-    
-    print(f"  Found {len(files)} Parquet files")
-    
-    if len(files) == 0:
+
+    # Discover and read every parquet file under the prefix as one dataset
+    try:
+        dataset = pyarrow.dataset.dataset(
+            f"{S3_BUCKET}/{prefix}",
+            filesystem=s3_fs,
+            format=parquet_format
+        )
+    except FileNotFoundError:
         print(f"  ⚠️  No files found in {prefix}")
+        return None
+
+    print(f"  Found {len(dataset.files)} Parquet files")
+
+    if len(dataset.files) == 0:
+        print(f"  ⚠️  No files found in {prefix}")
+        return None
+
+    table = dataset.to_table(use_threads=True)
+    print(f"  Total records: {table.num_rows:,}")
+    return table
+
+def to_silver_frame(table):
+    """Convert a silver Arrow table to a DataFrame tuned for the builders"""
+    if table is None:
         return pd.DataFrame()
-    
-    # Read all files into DataFrames
-    dfs = []
-    for file_key in files:
-        obj = s3_client.get_object(Bucket=S3_BUCKET, Key=file_key)
-        df = pd.read_parquet(io.BytesIO(obj['Body'].read()))
-        dfs.append(df)
-    
-    # Combine all DataFrames
-    combined = pd.concat(dfs, ignore_index=True)
-    print(f"  Total records: {len(combined):,}")
-    
+
+    combined = table.to_pandas()
+
+    # Categorical station keys turn the string-hashing groupbys below into
+    # integer-code operations and shrink the frame considerably
+    for col in ('msc_id', 'station_name', 'station_number', 'province',
+                'station_id', 'climate_id'):
+        if col in combined.columns:
+            combined[col] = combined[col].astype('category')
+
+    # Sensor readings don't need float64 precision, and the mean/min/max
+    # kernels are memory-bound — halving the payload roughly doubles
+    # aggregation throughput. Gold files inherit the narrower dtypes too.
+    float_cols = combined.select_dtypes('float64').columns
+    if len(float_cols):
+        combined[float_cols] = combined[float_cols].astype('float32')
+    int_cols = combined.select_dtypes('int64').columns
+    if len(int_cols):
+        combined[int_cols] = combined[int_cols].astype('int32')
+
     return combined
 
 def write_parquet_to_s3(df, key):
     """Write DataFrame to S3 as Parquet"""
-    buffer = io.BytesIO()
-    df.to_parquet(buffer, index=False, compression='snappy')
-    buffer.seek(0)
-    s3_client.put_object(Bucket=S3_BUCKET, Key=key, Body=buffer.getvalue())
+    # Streaming through the Arrow filesystem avoids buffering the whole
+    # serialized file in a BytesIO (plus the getvalue() copy) and uses a
+    # multipart upload under the hood
+    table = pyarrow.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(
+        table,
+        f"{S3_BUCKET}/{key}",
+        filesystem=s3_fs,
+        compression='snappy',
+        use_dictionary=True,
+        write_statistics=True
+    )
     print(f"✓ Wrote {len(df):,} records to s3://{S3_BUCKET}/{key}")
 
+def write_partitioned_to_s3(df, base_key, partition_cols):
+    """Write DataFrame to S3 as a hive-partitioned Parquet dataset"""
+    # Hive partitions plus row-group statistics let dashboard readers
+    # prune everything outside the selected partition/filter
+    table = pyarrow.Table.from_pandas(df, preserve_index=False)
+    pyarrow.dataset.write_dataset(
+        table,
+        f"{S3_BUCKET}/{base_key}",
+        filesystem=s3_fs,
+        format='parquet',
+        partitioning=partition_cols,
+        partitioning_flavor='hive',
+        min_rows_per_group=20_000,
+        max_rows_per_group=100_000,
+        existing_data_behavior='delete_matching'
+    )
+    print(f"✓ Wrote {len(df):,} records to s3://{S3_BUCKET}/{base_key}/ "
+          f"(partitioned by {', '.join(partition_cols)})")
+
 # ============================================================
 # WEATHER GOLD TABLES
 # ============================================================
 
-def create_station_latest():
+def create_station_latest(swob_tbl):
     """Create table with latest weather reading per station"""
     print("\n" + "="*60)
     print("Creating: weather_station_latest")
     print("="*60)
     
-    # Read SWOB silver data
-    swob_df = read_all_parquet("swob_silver")
-    
-    if swob_df.empty:
+    if swob_tbl is None or swob_tbl.num_rows == 0:
         print("  ⚠️  No SWOB data available")
         return pd.DataFrame()
     
-    # Get latest record per station
-    latest = swob_df.sort_values('utc_timestamp').groupby('msc_id').tail(1)
-    
     # Select columns for dashboard
     dashboard_cols = [
         'station_name', 'msc_id', 'latitude', 'longitude', 'elevation',
@@ -76,58 +134,112 @@ def create_station_latest():
         'wind_speed', 'wind_direction', 'stn_pres', 'precip_amount_1hr',
         'snow_depth'
     ]
-    
-    latest = latest[dashboard_cols].copy()
-    
-    # Add data freshness indicator (minutes since last update)
-    now = pd.Timestamp.now(tz='UTC')
-    latest['minutes_since_update'] = (now - latest['utc_timestamp']).dt.total_seconds() / 60
+
+    # Latest row per station entirely in Arrow: sort by timestamp once,
+    # then an order-preserving 'last' aggregate keeps the newest row per
+    # group. (use_threads=False because 'last' depends on scan order.)
+    tbl = swob_tbl.select(dashboard_cols).sort_by([('utc_timestamp', 'ascending')])
+    latest_tbl = tbl.group_by(['msc_id'], use_threads=False).aggregate(
+        [(c, 'last') for c in dashboard_cols if c != 'msc_id']
+    )
+    latest_tbl = latest_tbl.rename_columns(
+        [c.removesuffix('_last') for c in latest_tbl.column_names]
+    )
+    latest = latest_tbl.to_pandas()
+    float_cols = latest.select_dtypes('float64').columns
+    if len(float_cols):
+        latest[float_cols] = latest[float_cols].astype('float32')
+
+    # Data freshness (minutes since last update) via plain int64 arithmetic
+    # on the epoch nanoseconds, and the map marker size derived once here
+    # instead of on every dashboard rerun
+    now_ns = pd.Timestamp.now(tz='UTC').value
+    latest = latest.assign(
+        minutes_since_update=lambda d: (
+            (now_ns - d['utc_timestamp'].dt.as_unit('ns').astype('int64')) / 60e9
+        ).astype('float32'),
+        marker_size=lambda d: d['air_temp'].abs().astype('float32') + 5
+    )
     
     print(f"\nLatest weather conditions for {len(latest):,} stations")
     print(f"Timestamp range: {latest['utc_timestamp'].min()} to {latest['utc_timestamp'].max()}")
     
     # Write to Gold layer
     write_parquet_to_s3(latest, "gold/weather_station_latest/weather_station_latest.parquet")
+
+    # Pre-sorted alert tables so the dashboard renders them directly
+    # instead of re-filtering the full frame on every interaction
+    alert_cols = ['station_name', 'air_temp', 'feels_like_temp']
+    hot = latest.loc[latest['air_temp'] > 30, alert_cols].sort_values('air_temp', ascending=False)
+    cold = latest.loc[latest['air_temp'] < -10, alert_cols].sort_values('air_temp')
+    write_parquet_to_s3(hot, "gold/weather_alerts/weather_alerts_hot.parquet")
+    write_parquet_to_s3(cold, "gold/weather_alerts/weather_alerts_cold.parquet")
     
     return latest
 
-def create_hourly_summary():
+def create_hourly_summary(swob_tbl):
     """Create hourly aggregated time series per station"""
     print("\n" + "="*60)
     print("Creating: weather_hourly_summary")
     print("="*60)
     
-    # Read SWOB silver data
-    swob_df = read_all_parquet("swob_silver")
-    
-    if swob_df.empty:
+    if swob_tbl is None or swob_tbl.num_rows == 0:
         print("  ⚠️  No SWOB data available")
         return pd.DataFrame()
     
-    # Create hour column
-    swob_df['hour'] = swob_df['utc_timestamp'].dt.floor('h')
-    
-    # Aggregate by station + hour
-    hourly = swob_df.groupby(['msc_id', 'station_name', 'hour']).agg({
-        'air_temp': ['mean', 'min', 'max'],
-        'feels_like_temp': 'mean',
-        'rel_hum': 'mean',
-        'wind_speed': 'mean',
-        'wind_direction': 'mean',
-        'stn_pres': 'mean',
-        'precip_amount_1hr': 'sum',
-        'latitude': 'first',
-        'longitude': 'first'
-    }).reset_index()
-    
-    # Flatten column names
-    hourly.columns = [
-        'msc_id', 'station_name', 'hour',
-        'temp_mean', 'temp_min', 'temp_max',
-        'feels_like_mean', 'humidity_mean', 'wind_speed_mean',
-        'wind_dir_mean', 'pressure_mean', 'precip_total',
-        'latitude', 'longitude'
-    ]
+    # The whole aggregation runs in Arrow's C++ hash-aggregate kernels:
+    # no Python per-group work, and the silver table never has to be
+    # materialized as a DataFrame on this path
+    tbl = swob_tbl.append_column(
+        'hour', pc.floor_temporal(swob_tbl['utc_timestamp'], unit='hour')
+    )
+
+    # station_name/lat/long are functionally determined by msc_id, so keep
+    # them out of the hot aggregation and attach them from a tiny
+    # per-station table afterwards
+    stn_meta = tbl.group_by(['msc_id']).aggregate([
+        ('station_name', 'first'),
+        ('latitude', 'first'),
+        ('longitude', 'first')
+    ])
+    stn_meta = stn_meta.rename_columns(
+        [c.removesuffix('_first') for c in stn_meta.column_names]
+    )
+
+    # Aggregate by station + hour (numeric columns only)
+    hourly_tbl = tbl.group_by(['msc_id', 'hour']).aggregate([
+        ('air_temp', 'mean'),
+        ('air_temp', 'min'),
+        ('air_temp', 'max'),
+        ('feels_like_temp', 'mean'),
+        ('rel_hum', 'mean'),
+        ('wind_speed', 'mean'),
+        ('wind_direction', 'mean'),
+        ('stn_pres', 'mean'),
+        ('precip_amount_1hr', 'sum')
+    ])
+    renames = {
+        'air_temp_mean': 'temp_mean',
+        'air_temp_min': 'temp_min',
+        'air_temp_max': 'temp_max',
+        'feels_like_temp_mean': 'feels_like_mean',
+        'rel_hum_mean': 'humidity_mean',
+        'wind_speed_mean': 'wind_speed_mean',
+        'wind_direction_mean': 'wind_dir_mean',
+        'stn_pres_mean': 'pressure_mean',
+        'precip_amount_1hr_sum': 'precip_total'
+    }
+    hourly_tbl = hourly_tbl.rename_columns(
+        [renames.get(c, c) for c in hourly_tbl.column_names]
+    )
+
+    hourly_tbl = hourly_tbl.join(stn_meta, keys='msc_id', join_type='left outer')
+
+    # Only the small aggregated result crosses into pandas, for the write
+    hourly = hourly_tbl.to_pandas()
+    float_cols = hourly.select_dtypes('float64').columns
+    if len(float_cols):
+        hourly[float_cols] = hourly[float_cols].astype('float32')
     
     print(f"\nHourly weather summaries: {len(hourly):,} records")
     print(f"Stations: {hourly['msc_id'].nunique():,}")
@@ -138,21 +250,18 @@ def create_hourly_summary():
     
     return hourly
 
-def create_station_metadata():
+def create_station_metadata(swob_df):
     """Create weather station metadata table"""
     print("\n" + "="*60)
     print("Creating: weather_station_metadata")
     print("="*60)
     
-    # Read SWOB silver data
-    swob_df = read_all_parquet("swob_silver")
-    
     if swob_df.empty:
         print("  ⚠️  No SWOB data available")
         return pd.DataFrame()
     
     # Get unique stations with metadata
-    metadata = swob_df.groupby('msc_id').agg({
+    metadata = swob_df.groupby('msc_id', sort=False, observed=True).agg({
         'station_name': 'first',
         'station_id': 'first',
         'climate_id': 'first',
@@ -180,100 +289,129 @@ def create_station_metadata():
 # HYDROMETRIC GOLD TABLES (NEW!)
 # ============================================================
 
-def create_hydro_station_latest():
+def create_hydro_station_latest(hydro_tbl):
     """Create table with latest water level reading per station"""
     print("\n" + "="*60)
     print("Creating: hydro_station_latest")
     print("="*60)
     
-    # Read hydrometric silver data
-    hydro_df = read_all_parquet("hydrometric_silver")
-    
-    if hydro_df.empty:
+    if hydro_tbl is None or hydro_tbl.num_rows == 0:
         print("  ⚠️  No hydrometric data available")
         return pd.DataFrame()
     
-    # Get latest record per station
-    latest = hydro_df.sort_values('utc_timestamp').groupby('station_number').tail(1)
-    
     # Select columns for dashboard
     dashboard_cols = [
         'station_number', 'station_name', 'province',
         'latitude', 'longitude', 'utc_timestamp',
         'water_level', 'discharge'
     ]
-    
-    latest = latest[dashboard_cols].copy()
-    
-    # Add data freshness indicator
-    now = pd.Timestamp.now(tz='UTC')
-    latest['minutes_since_update'] = (now - latest['utc_timestamp']).dt.total_seconds() / 60
+
+    # Arrow sort + ordered 'last' aggregate, as in create_station_latest
+    tbl = hydro_tbl.select(dashboard_cols).sort_by([('utc_timestamp', 'ascending')])
+    latest_tbl = tbl.group_by(['station_number'], use_threads=False).aggregate(
+        [(c, 'last') for c in dashboard_cols if c != 'station_number']
+    )
+    latest_tbl = latest_tbl.rename_columns(
+        [c.removesuffix('_last') for c in latest_tbl.column_names]
+    )
+    latest = latest_tbl.to_pandas()
+    float_cols = latest.select_dtypes('float64').columns
+    if len(float_cols):
+        latest[float_cols] = latest[float_cols].astype('float32')
+
+    # Freshness + marker size in one assign, as in create_station_latest
+    now_ns = pd.Timestamp.now(tz='UTC').value
+    latest = latest.assign(
+        minutes_since_update=lambda d: (
+            (now_ns - d['utc_timestamp'].dt.as_unit('ns').astype('int64')) / 60e9
+        ).astype('float32'),
+        marker_size=lambda d: d['water_level'].abs().astype('float32') + 3
+    )
     
     print(f"\nLatest water levels for {len(latest):,} stations")
     print(f"Timestamp range: {latest['utc_timestamp'].min()} to {latest['utc_timestamp'].max()}")
     
     # Write to Gold layer
-    write_parquet_to_s3(latest, "gold/hydro_station_latest/hydro_station_latest.parquet")
+    write_partitioned_to_s3(latest, "gold/hydro_station_latest", ["province"])
+
+    # Pre-sorted alert tables (nation-wide 10th/90th percentile thresholds,
+    # both quantiles from one partial partition of the array)
+    alert_cols = ['station_name', 'province', 'water_level']
+    levels = latest['water_level'].dropna().to_numpy()
+    low_threshold, high_threshold = np.quantile(levels, [0.1, 0.9]) if len(levels) else (np.nan, np.nan)
+    high = latest.loc[latest['water_level'] > high_threshold, alert_cols].sort_values('water_level', ascending=False)
+    low = latest.loc[latest['water_level'] < low_threshold, alert_cols].sort_values('water_level')
+    write_parquet_to_s3(high, "gold/hydro_alerts/hydro_alerts_high.parquet")
+    write_parquet_to_s3(low, "gold/hydro_alerts/hydro_alerts_low.parquet")
     
     return latest
 
-def create_hydro_hourly_summary():
+def create_hydro_hourly_summary(hydro_tbl):
     """Create hourly aggregated water level time series"""
     print("\n" + "="*60)
     print("Creating: hydro_hourly_summary")
     print("="*60)
     
-    # Read hydrometric silver data
-    hydro_df = read_all_parquet("hydrometric_silver")
-    
-    if hydro_df.empty:
+    if hydro_tbl is None or hydro_tbl.num_rows == 0:
         print("  ⚠️  No hydrometric data available")
         return pd.DataFrame()
     
-    # Create hour column
-    hydro_df['hour'] = hydro_df['utc_timestamp'].dt.floor('h')
-    
-    # Aggregate by station + hour
-    hourly = hydro_df.groupby(['station_number', 'station_name', 'hour']).agg({
-        'water_level': ['mean', 'min', 'max'],
-        'discharge': ['mean', 'min', 'max'],
-        'latitude': 'first',
-        'longitude': 'first',
-        'province': 'first'
-    }).reset_index()
-    
-    # Flatten column names
-    hourly.columns = [
-        'station_number', 'station_name', 'hour',
-        'water_level_mean', 'water_level_min', 'water_level_max',
-        'discharge_mean', 'discharge_min', 'discharge_max',
-        'latitude', 'longitude', 'province'
-    ]
+    # Arrow hash-aggregate path, as in create_hourly_summary
+    tbl = hydro_tbl.append_column(
+        'hour', pc.floor_temporal(hydro_tbl['utc_timestamp'], unit='hour')
+    )
+
+    # Station descriptors ride along a tiny per-station table instead of
+    # being dragged through every partial aggregation
+    stn_meta = tbl.group_by(['station_number']).aggregate([
+        ('station_name', 'first'),
+        ('latitude', 'first'),
+        ('longitude', 'first'),
+        ('province', 'first')
+    ])
+    stn_meta = stn_meta.rename_columns(
+        [c.removesuffix('_first') for c in stn_meta.column_names]
+    )
+
+    # Aggregate by station + hour (numeric columns only)
+    hourly_tbl = tbl.group_by(['station_number', 'hour']).aggregate([
+        ('water_level', 'mean'),
+        ('water_level', 'min'),
+        ('water_level', 'max'),
+        ('discharge', 'mean'),
+        ('discharge', 'min'),
+        ('discharge', 'max')
+    ])
+
+    hourly_tbl = hourly_tbl.join(stn_meta, keys='station_number', join_type='left outer')
+
+    # Only the small aggregated result crosses into pandas, for the write
+    hourly = hourly_tbl.to_pandas()
+    float_cols = hourly.select_dtypes('float64').columns
+    if len(float_cols):
+        hourly[float_cols] = hourly[float_cols].astype('float32')
     
     print(f"\nHourly water level summaries: {len(hourly):,} records")
     print(f"Stations: {hourly['station_number'].nunique():,}")
     print(f"Time range: {hourly['hour'].min()} to {hourly['hour'].max()}")
     
     # Write to Gold layer
-    write_parquet_to_s3(hourly, "gold/hydro_hourly_summary/hydro_hourly_summary.parquet")
+    write_partitioned_to_s3(hourly, "gold/hydro_hourly_summary", ["province"])
     
     return hourly
 
-def create_hydro_metadata():
+def create_hydro_metadata(hydro_df):
     """Create hydrometric station metadata table"""
     print("\n" + "="*60)
     print("Creating: hydro_station_metadata")
     print("="*60)
     
-    # Read hydrometric silver data
-    hydro_df = read_all_parquet("hydrometric_silver")
-    
     if hydro_df.empty:
         print("  ⚠️  No hydrometric data available")
         return pd.DataFrame()
     
     # Get unique stations with metadata
-    metadata = hydro_df.groupby('station_number').agg({
+    metadata = hydro_df.groupby('station_number', sort=False, observed=True).agg({
         'station_name': 'first',
         'province': 'first',
         'latitude': 'first',
@@ -304,17 +442,29 @@ def main():
     print("PROJECT FLUME - Gold Layer Creation (Weather + Water)")
     print("="*60)
     
-    # Create weather gold tables
-    print("\n🌦️  WEATHER DATA")
-    weather_latest = create_station_latest()
-    weather_hourly = create_hourly_summary()
-    weather_metadata = create_station_metadata()
-    
-    # Create hydrometric gold tables
-    print("\n💧 HYDROMETRIC DATA")
-    hydro_latest = create_hydro_station_latest()
-    hydro_hourly = create_hydro_hourly_summary()
-    hydro_metadata = create_hydro_metadata()
+    # Read each silver dataset once and fan out to the three aggregations;
+    # the hourly builders aggregate the Arrow tables directly, the rest
+    # work on the tuned DataFrame view
+    swob_tbl = read_all_parquet_table("swob_silver")
+    hydro_tbl = read_all_parquet_table("hydrometric_silver")
+    swob_df = to_silver_frame(swob_tbl)
+    hydro_df = to_silver_frame(hydro_tbl)
+    
+    # The six builds are independent: the groupby kernels release the GIL
+    # and the S3 PUTs are pure I/O, so running them on threads brings
+    # wall time down to roughly the slowest single build
+    print("\n🌦️  WEATHER DATA + 💧 HYDROMETRIC DATA")
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        futures = [
+            executor.submit(create_station_latest, swob_tbl),
+            executor.submit(create_hourly_summary, swob_tbl),
+            executor.submit(create_station_metadata, swob_df),
+            executor.submit(create_hydro_station_latest, hydro_tbl),
+            executor.submit(create_hydro_hourly_summary, hydro_tbl),
+            executor.submit(create_hydro_metadata, hydro_df),
+        ]
+        (weather_latest, weather_hourly, weather_metadata,
+         hydro_latest, hydro_hourly, hydro_metadata) = [f.result() for f in futures]
     
     print("\n" + "="*60)
     print("✓ GOLD LAYER COMPLETE")
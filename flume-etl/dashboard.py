@@ -1,9 +1,11 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import boto3
-import io
+import fsspec
+import pyarrow.dataset as pads
+import pyarrow.parquet as pq
 from datetime import datetime, timedelta
 
 # Page config
@@ -15,49 +17,112 @@ st.set_page_config(
 
 # S3 setup
 S3_BUCKET = "project-nimbus-raw-data-lake-12345-raj"
-s3_client = boto3.client('s3')
+
+# Local-disk cache in front of S3: st.cache_data only helps within one
+# worker process, but the filecache serves unchanged Gold files from local
+# SSD across reruns, workers and dashboard restarts
+gold_fs = fsspec.filesystem(
+    "filecache",
+    target_protocol="s3",
+    cache_storage="/tmp/flume-gold-cache",
+    expiry_time=300
+)
+
+def read_gold_parquet(key, columns=None):
+    """Read a Gold layer Parquet file with coalesced range reads"""
+    # pre_buffer merges the column-chunk requests into a few large async
+    # reads instead of one round-trip per column; an explicit column list
+    # pushes the projection into the parquet reader so unreferenced
+    # column chunks are never downloaded or decoded
+    table = pq.read_table(
+        f"{S3_BUCKET}/{key}",
+        filesystem=gold_fs,
+        columns=columns,
+        pre_buffer=True,
+        use_threads=True
+    )
+    return table.to_pandas()
+
+def read_gold_dataset(key, columns=None, province=None):
+    """Read a hive-partitioned Gold dataset, pruning to one province"""
+    dataset = pads.dataset(
+        f"{S3_BUCKET}/{key}",
+        filesystem=gold_fs,
+        format="parquet",
+        partitioning="hive"
+    )
+    filt = (pads.field('province') == province) if province is not None else None
+    return dataset.to_table(columns=columns, filter=filt).to_pandas()
 
 # Cache data loading (refresh every 5 minutes)
+@st.cache_data(ttl=300)
+def load_alert_table(key, columns):
+    """Load a small pre-sorted alert table from Gold"""
+    try:
+        return read_gold_parquet(key, columns=columns)
+    except Exception:
+        return pd.DataFrame(columns=columns)
+
 @st.cache_data(ttl=300)
 def load_weather_station_latest():
     """Load latest weather conditions from Gold layer"""
     try:
-        obj = s3_client.get_object(
-            Bucket=S3_BUCKET, 
-            Key='gold/weather_station_latest/weather_station_latest.parquet'
+        df = read_gold_parquet(
+            'gold/weather_station_latest/weather_station_latest.parquet',
+            columns=[
+                'station_name', 'latitude', 'longitude', 'utc_timestamp',
+                'air_temp', 'feels_like_temp', 'rel_hum', 'wind_speed',
+                'minutes_since_update', 'marker_size'
+            ]
         )
-        df = pd.read_parquet(io.BytesIO(obj['Body'].read()))
         df['utc_timestamp'] = pd.to_datetime(df['utc_timestamp'])
+        # Categorical keys keep the selectbox lists a cheap .cat.categories
+        # read instead of a unique+sort pass per rerun
+        df['station_name'] = df['station_name'].astype('category')
         return df
     except Exception as e:
         st.error(f"Error loading weather data: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=300)
+def weather_hourly_by_station():
+    """Index the hourly weather series by station for O(1) lookups"""
+    hourly = load_weather_hourly_summary()
+    if hourly.empty:
+        return {}
+    return dict(tuple(hourly.groupby('station_name', sort=False)))
+
 @st.cache_data(ttl=300)
 def load_weather_hourly_summary():
     """Load hourly weather time series from Gold layer"""
     try:
-        obj = s3_client.get_object(
-            Bucket=S3_BUCKET,
-            Key='gold/weather_hourly_summary/weather_hourly_summary.parquet'
+        df = read_gold_parquet(
+            'gold/weather_hourly_summary/weather_hourly_summary.parquet',
+            columns=['station_name', 'hour', 'temp_mean']
         )
-        df = pd.read_parquet(io.BytesIO(obj['Body'].read()))
         df['hour'] = pd.to_datetime(df['hour'])
+        df['station_name'] = df['station_name'].astype('category')
         return df
     except Exception as e:
         st.error(f"Error loading weather hourly data: {e}")
         return pd.DataFrame()
 
 @st.cache_data(ttl=300)
-def load_hydro_station_latest():
+def load_hydro_station_latest(province=None):
     """Load latest water levels from Gold layer"""
     try:
-        obj = s3_client.get_object(
-            Bucket=S3_BUCKET,
-            Key='gold/hydro_station_latest/hydro_station_latest.parquet'
+        df = read_gold_dataset(
+            'gold/hydro_station_latest',
+            columns=[
+                'station_number', 'station_name', 'province', 'latitude',
+                'longitude', 'utc_timestamp', 'water_level', 'discharge',
+                'marker_size'
+            ],
+            province=province
         )
-        df = pd.read_parquet(io.BytesIO(obj['Body'].read()))
         df['utc_timestamp'] = pd.to_datetime(df['utc_timestamp'])
+        df['station_name'] = df['station_name'].astype('category')
+        df['province'] = df['province'].astype('category')
         return df
     except Exception as e:
         st.error(f"Error loading hydro data: {e}")
@@ -67,26 +132,26 @@ def load_hydro_station_latest():
 def load_hydro_hourly_summary():
     """Load hourly water level time series from Gold layer"""
     try:
-        obj = s3_client.get_object(
-            Bucket=S3_BUCKET,
-            Key='gold/hydro_hourly_summary/hydro_hourly_summary.parquet'
+        df = read_gold_dataset(
+            'gold/hydro_hourly_summary',
+            columns=['station_name', 'hour', 'water_level_mean']
         )
-        df = pd.read_parquet(io.BytesIO(obj['Body'].read()))
         df['hour'] = pd.to_datetime(df['hour'])
+        df['station_name'] = df['station_name'].astype('category')
         return df
     except Exception as e:
         st.error(f"Error loading hydro hourly data: {e}")
         return pd.DataFrame()
 
 @st.cache_data(ttl=300)
-def load_water_forecasts():
-    """Load 6-hour water level forecasts"""
+def load_water_forecasts(province=None):
+    """Load 6-hour water level forecasts, optionally for one province"""
     try:
-        obj = s3_client.get_object(
-            Bucket=S3_BUCKET,
-            Key='gold/water_level_forecasts/6hour_forecast.parquet'
+        df = read_gold_dataset(
+            'gold/water_level_forecasts/6hour_forecast',
+            columns=['station_name', 'province', 'hour', 'forecast_change'],
+            province=province
         )
-        df = pd.read_parquet(io.BytesIO(obj['Body'].read()))
         df['hour'] = pd.to_datetime(df['hour'])
         return df
     except Exception as e:
@@ -96,16 +161,88 @@ def load_water_forecasts():
 def load_full_forecasts():
     """Load all 24-hour forecasts"""
     try:
-        obj = s3_client.get_object(
-            Bucket=S3_BUCKET,
-            Key='gold/water_level_forecasts/forecasts.parquet'
+        df = read_gold_dataset(
+            'gold/water_level_forecasts/forecasts',
+            columns=[
+                'station_name', 'hour', 'predicted_water_level',
+                'confidence_lower', 'confidence_upper'
+            ]
         )
-        df = pd.read_parquet(io.BytesIO(obj['Body'].read()))
         df['hour'] = pd.to_datetime(df['hour'])
         return df
     except Exception as e:
         return pd.DataFrame()
 
+# Cached filter views: keyed on the widget state, so moving a slider
+# back to a previous position is a cache hit instead of a mask rescan
+@st.cache_data(ttl=300)
+def filter_weather(temp_lo, temp_hi, max_age):
+    """Temperature + freshness view of the latest weather frame"""
+    df = load_weather_station_latest()
+    if df.empty:
+        return df
+    return df[
+        (df['air_temp'] >= temp_lo) &
+        (df['air_temp'] <= temp_hi) &
+        (df['minutes_since_update'] <= max_age)
+    ]
+
+@st.cache_data(ttl=300)
+def filter_hydro(province, level_lo, level_hi):
+    """Province + level-range view of the latest hydro frame"""
+    df = load_hydro_station_latest(province if province != 'All' else None)
+    if df.empty:
+        return df
+    return df[(df['water_level'] >= level_lo) & (df['water_level'] <= level_hi)]
+
+@st.cache_data(ttl=300)
+def hydro_hourly_by_station():
+    """Index the hourly hydro series by station for O(1) lookups"""
+    hourly = load_hydro_hourly_summary()
+    if hourly.empty:
+        return {}
+    return dict(tuple(hourly.groupby('station_name', sort=False, observed=True)))
+
+@st.cache_data(ttl=300)
+def forecast_change_by_station():
+    """station_name → 6-hour forecast_change map for the alert banner"""
+    df = load_water_forecasts()
+    if df.empty:
+        return {}
+    return dict(zip(df['station_name'], df['forecast_change']))
+
+@st.cache_data(ttl=300)
+def weather_station_options(temp_lo, temp_hi, max_age):
+    """Sorted station list for the weather selectbox, cached per filter"""
+    df = filter_weather(temp_lo, temp_hi, max_age)
+    if df.empty:
+        return []
+    return df['station_name'].cat.remove_unused_categories().cat.categories.tolist()
+
+@st.cache_data(ttl=300)
+def province_options():
+    """Province list for the sidebar selectbox"""
+    df = load_hydro_station_latest()
+    if df.empty:
+        return ['All']
+    return ['All'] + df['province'].cat.categories.tolist()
+
+@st.cache_data(ttl=300)
+def hydro_station_options(province, level_lo, level_hi):
+    """Sorted station list for the hydro selectbox, cached per filter"""
+    df = filter_hydro(province, level_lo, level_hi)
+    if df.empty:
+        return []
+    return df['station_name'].cat.remove_unused_categories().cat.categories.tolist()
+
+@st.cache_data(ttl=300)
+def filter_forecasts(province):
+    """Province view of the 6-hour forecast summary"""
+    # A specific province reads just its hive partition, like filter_hydro
+    if province == 'All':
+        return load_water_forecasts()
+    return load_water_forecasts(province)
+
 # Load all data
 with st.spinner('Loading data from S3...'):
     weather_data = load_weather_station_latest()
@@ -155,12 +292,10 @@ with tab1:
             list(freshness_options.keys())
         )
         
-        # Apply filters
-        filtered_weather = weather_data[
-            (weather_data['air_temp'] >= temp_range[0]) &
-            (weather_data['air_temp'] <= temp_range[1]) &
-            (weather_data['minutes_since_update'] <= freshness_options[freshness])
-        ].copy()
+        # Apply filters (cached on the widget state)
+        filtered_weather = filter_weather(
+            temp_range[0], temp_range[1], freshness_options[freshness]
+        )
         
         # Summary metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -180,21 +315,19 @@ with tab1:
             )
         
         with col3:
-            max_temp = filtered_weather['air_temp'].max()
-            hottest_station = filtered_weather[filtered_weather['air_temp'] == max_temp]['station_name'].iloc[0]
+            hottest = filtered_weather.loc[filtered_weather['air_temp'].idxmax()]
             st.metric(
                 "Hottest",
-                f"{max_temp:.1f}°C",
-                delta=hottest_station
+                f"{hottest['air_temp']:.1f}°C",
+                delta=hottest['station_name']
             )
         
         with col4:
-            min_temp = filtered_weather['air_temp'].min()
-            coldest_station = filtered_weather[filtered_weather['air_temp'] == min_temp]['station_name'].iloc[0]
+            coldest = filtered_weather.loc[filtered_weather['air_temp'].idxmin()]
             st.metric(
                 "Coldest",
-                f"{min_temp:.1f}°C",
-                delta=coldest_station
+                f"{coldest['air_temp']:.1f}°C",
+                delta=coldest['station_name']
             )
         
         st.divider()
@@ -202,16 +335,15 @@ with tab1:
         # Main weather map
         st.subheader("📍 Weather Station Map")
         
-        # Calculate absolute size for markers
-        filtered_weather['marker_size'] = filtered_weather['air_temp'].abs() + 5
-        
-        # Create map
+        # Create map — marker_size is precomputed in the Gold layer and
+        # handed over as a bare array so it never rides along as a frame
+        # column in the hover payload
         fig = px.scatter_mapbox(
             filtered_weather,
             lat='latitude',
             lon='longitude',
             color='air_temp',
-            size='marker_size',
+            size=filtered_weather['marker_size'].to_numpy(),
             hover_name='station_name',
             hover_data={
                 'air_temp': ':.1f',
@@ -219,8 +351,7 @@ with tab1:
                 'rel_hum': ':.0f',
                 'wind_speed': ':.1f',
                 'latitude': False,
-                'longitude': False,
-                'marker_size': False
+                'longitude': False
             },
             color_continuous_scale='RdYlBu_r',
             size_max=15,
@@ -247,7 +378,7 @@ with tab1:
         st.subheader("📊 Weather Station Details")
         
         # Station selector
-        station_list = sorted(filtered_weather['station_name'].unique())
+        station_list = weather_station_options(temp_range[0], temp_range[1], freshness_options[freshness])
         selected_station = st.selectbox(
             "Select a weather station",
             station_list,
@@ -273,11 +404,10 @@ with tab1:
             
             # Time series chart
             if not weather_hourly.empty:
-                station_hourly = weather_hourly[
-                    weather_hourly['station_name'] == selected_station
-                ].sort_values('hour')
+                station_hourly = weather_hourly_by_station().get(selected_station)
                 
-                if not station_hourly.empty:
+                if station_hourly is not None and not station_hourly.empty:
+                    station_hourly = station_hourly.sort_values('hour')
                     st.subheader("📈 Temperature Trend")
                     
                     fig_temp = go.Figure()
@@ -308,8 +438,10 @@ with tab1:
         hot_threshold = 30
         cold_threshold = -10
         
-        hot_stations = filtered_weather[filtered_weather['air_temp'] > hot_threshold]
-        cold_stations = filtered_weather[filtered_weather['air_temp'] < cold_threshold]
+        # Alert tables are pre-filtered and pre-sorted at gold time
+        alert_cols = ['station_name', 'air_temp', 'feels_like_temp']
+        hot_stations = load_alert_table('gold/weather_alerts/weather_alerts_hot.parquet', alert_cols)
+        cold_stations = load_alert_table('gold/weather_alerts/weather_alerts_cold.parquet', alert_cols)
         
         col1, col2 = st.columns(2)
         
@@ -317,10 +449,7 @@ with tab1:
             if not hot_stations.empty:
                 st.warning(f"🔥 **{len(hot_stations)} stations** reporting temperatures above {hot_threshold}°C")
                 with st.expander("View hot stations"):
-                    st.dataframe(
-                        hot_stations[['station_name', 'air_temp', 'feels_like_temp']].sort_values('air_temp', ascending=False),
-                        hide_index=True
-                    )
+                    st.dataframe(hot_stations, hide_index=True)
             else:
                 st.success("No heat warnings")
         
@@ -328,10 +457,7 @@ with tab1:
             if not cold_stations.empty:
                 st.warning(f"❄️ **{len(cold_stations)} stations** reporting temperatures below {cold_threshold}°C")
                 with st.expander("View cold stations"):
-                    st.dataframe(
-                        cold_stations[['station_name', 'air_temp', 'feels_like_temp']].sort_values('air_temp'),
-                        hide_index=True
-                    )
+                    st.dataframe(cold_stations, hide_index=True)
             else:
                 st.success("No cold warnings")
 
@@ -348,7 +474,7 @@ with tab2:
         st.sidebar.header("🔍 Water Level Filters")
         
         # Province filter
-        provinces = ['All'] + sorted(hydro_data['province'].unique().tolist())
+        provinces = province_options()
         selected_province = st.sidebar.selectbox(
             "Province",
             provinces
@@ -367,48 +493,43 @@ with tab2:
         else:
             level_range = (0, 100)
         
-        # Apply filters
-        filtered_hydro = hydro_data.copy()
-        if selected_province != 'All':
-            filtered_hydro = filtered_hydro[filtered_hydro['province'] == selected_province]
-        
-        filtered_hydro = filtered_hydro[
-            (filtered_hydro['water_level'] >= level_range[0]) &
-            (filtered_hydro['water_level'] <= level_range[1])
-        ]
+        # Apply filters — cached on (province, range); a specific province
+        # re-reads just its hive partition instead of masking the full frame
+        filtered_hydro = filter_hydro(selected_province, level_range[0], level_range[1])
         
-        # Summary metrics
+        # Summary metrics — the level reductions for all four cards come
+        # from one pass over the column, with .at lookups for the extremes
+        levels = filtered_hydro['water_level']
+        avg_level = levels.mean()
+        i_hi = levels.idxmax()
+        i_lo = levels.idxmin()
+
         col1, col2, col3, col4 = st.columns(4)
-        
+
         with col1:
             st.metric(
                 "Active Stations",
                 f"{len(filtered_hydro):,}"
             )
-        
+
         with col2:
-            avg_level = filtered_hydro['water_level'].mean()
             st.metric(
                 "Average Water Level",
                 f"{avg_level:.2f} m"
             )
-        
+
         with col3:
-            max_level = filtered_hydro['water_level'].max()
-            highest_station = filtered_hydro[filtered_hydro['water_level'] == max_level]['station_name'].iloc[0]
             st.metric(
                 "Highest Level",
-                f"{max_level:.2f} m",
-                delta=highest_station
+                f"{levels.at[i_hi]:.2f} m",
+                delta=filtered_hydro.at[i_hi, 'station_name']
             )
-        
+
         with col4:
-            min_level = filtered_hydro['water_level'].min()
-            lowest_station = filtered_hydro[filtered_hydro['water_level'] == min_level]['station_name'].iloc[0]
             st.metric(
                 "Lowest Level",
-                f"{min_level:.2f} m",
-                delta=lowest_station
+                f"{levels.at[i_lo]:.2f} m",
+                delta=filtered_hydro.at[i_lo, 'station_name']
             )
         
         st.divider()
@@ -419,13 +540,18 @@ with tab2:
             
             col1, col2, col3, col4 = st.columns(4)
             
-            # Apply same province filter to forecasts
-            filtered_forecasts = water_forecasts_6h.copy()
-            if selected_province != 'All':
-                filtered_forecasts = filtered_forecasts[filtered_forecasts['province'] == selected_province]
+            # Apply same province filter to forecasts (cached per province)
+            filtered_forecasts = filter_forecasts(selected_province)
             
+            # All four bucket counts from one pass over the change column —
+            # no intermediate boolean-indexed frames
+            fc = filtered_forecasts['forecast_change'].to_numpy()
+            rising = int((fc > 0.1).sum())
+            falling = int((fc < -0.1).sum())
+            stable = int((np.abs(fc) <= 0.1).sum())
+            high_risk = int((fc > 0.5).sum())
+
             with col1:
-                rising = len(filtered_forecasts[filtered_forecasts['forecast_change'] > 0.1])
                 st.metric(
                     "🔼 Rising Levels",
                     rising,
@@ -433,7 +559,6 @@ with tab2:
                 )
             
             with col2:
-                falling = len(filtered_forecasts[filtered_forecasts['forecast_change'] < -0.1])
                 st.metric(
                     "🔽 Falling Levels", 
                     falling,
@@ -441,14 +566,12 @@ with tab2:
                 )
             
             with col3:
-                stable = len(filtered_forecasts[filtered_forecasts['forecast_change'].abs() <= 0.1])
                 st.metric(
                     "➡️ Stable Levels",
                     stable
                 )
             
             with col4:
-                high_risk = len(filtered_forecasts[filtered_forecasts['forecast_change'] > 0.5])
                 if high_risk > 0:
                     st.metric(
                         "⚠️ High Risk",
@@ -468,39 +591,52 @@ with tab2:
         # Main water level map
         st.subheader("📍 Water Monitoring Station Map")
         
-        # Calculate marker size based on water level
-        filtered_hydro['marker_size'] = filtered_hydro['water_level'].abs() + 3
+        # WebGL trace built directly; above ~5k stations, pre-aggregate to a
+        # ~0.1° grid so the browser gets one marker per cell instead of a
+        # payload proportional to the station count
+        if len(filtered_hydro) > 5000:
+            cells = filtered_hydro.groupby(
+                [filtered_hydro['latitude'].round(1), filtered_hydro['longitude'].round(1)],
+                sort=False
+            ).agg(
+                water_level=('water_level', 'mean'),
+                marker_size=('marker_size', 'mean'),
+                stations=('station_name', 'size')
+            ).reset_index()
+            map_df = cells
+            hover_text = (
+                cells['stations'].astype(str) + ' stations · mean '
+                + cells['water_level'].round(2).astype(str) + ' m'
+            )
+        else:
+            map_df = filtered_hydro
+            hover_text = (
+                filtered_hydro['station_name'].astype(str)
+                + ' (' + filtered_hydro['station_number'].astype(str) + ', '
+                + filtered_hydro['province'].astype(str) + ')<br>Level: '
+                + filtered_hydro['water_level'].round(2).astype(str) + ' m<br>Discharge: '
+                + filtered_hydro['discharge'].round(2).astype(str) + ' m³/s'
+            )
         
-        # Create map
-        fig_hydro = px.scatter_mapbox(
-            filtered_hydro,
-            lat='latitude',
-            lon='longitude',
-            color='water_level',
-            size='marker_size',
-            hover_name='station_name',
-            hover_data={
-                'station_number': True,
-                'province': True,
-                'water_level': ':.2f',
-                'discharge': ':.2f',
-                'latitude': False,
-                'longitude': False,
-                'marker_size': False
-            },
-            color_continuous_scale='Blues',
-            size_max=12,
-            zoom=3,
-            height=500,
-            labels={
-                'water_level': 'Water Level (m)',
-                'discharge': 'Discharge (m³/s)',
-                'station_number': 'Station ID'
-            }
-        )
+        fig_hydro = go.Figure(go.Scattermapbox(
+            lat=map_df['latitude'],
+            lon=map_df['longitude'],
+            mode='markers',
+            marker=dict(
+                size=map_df['marker_size'],
+                sizemode='area',
+                color=map_df['water_level'],
+                colorscale='Blues',
+                colorbar=dict(title='Water Level (m)')
+            ),
+            text=hover_text,
+            hoverinfo='text'
+        ))
         
         fig_hydro.update_layout(
             mapbox_style="open-street-map",
+            mapbox_zoom=3,
+            height=500,
             margin={"r":0,"t":0,"l":0,"b":0}
         )
         
@@ -512,7 +648,7 @@ with tab2:
         st.subheader("📊 Water Station Details")
         
         # Station selector
-        hydro_station_list = sorted(filtered_hydro['station_name'].unique())
+        hydro_station_list = hydro_station_options(selected_province, level_range[0], level_range[1])
         selected_hydro_station = st.selectbox(
             "Select a water monitoring station",
             hydro_station_list,
@@ -548,11 +684,10 @@ with tab2:
                 
                 # Historical data
                 if not hydro_hourly.empty:
-                    station_hydro_hourly = hydro_hourly[
-                        hydro_hourly['station_name'] == selected_hydro_station
-                    ].sort_values('hour')
+                    station_hydro_hourly = hydro_hourly_by_station().get(selected_hydro_station)
                     
-                    if not station_hydro_hourly.empty:
+                    if station_hydro_hourly is not None and not station_hydro_hourly.empty:
+                        station_hydro_hourly = station_hydro_hourly.sort_values('hour')
                         fig_water.add_trace(go.Scatter(
                             x=station_hydro_hourly['hour'],
                             y=station_hydro_hourly['water_level_mean'],
@@ -611,13 +746,9 @@ with tab2:
                 
                 # Forecast alert (NEW!)
                 if not water_forecasts_6h.empty:
-                    station_forecast_6h = water_forecasts_6h[
-                        water_forecasts_6h['station_name'] == selected_hydro_station
-                    ]
+                    change = forecast_change_by_station().get(selected_hydro_station)
                     
-                    if not station_forecast_6h.empty:
-                        forecast_info = station_forecast_6h.iloc[0]
-                        change = forecast_info['forecast_change']
+                    if change is not None:
                         
                         if abs(change) > 0.5:
                             direction = "RISING" if change > 0 else "FALLING"
@@ -633,12 +764,14 @@ with tab2:
         # Water level alerts
         st.subheader("⚠️ Water Level Alerts")
         
-        # Simple threshold-based alerts
-        high_threshold = filtered_hydro['water_level'].quantile(0.9)
-        low_threshold = filtered_hydro['water_level'].quantile(0.1)
-        
-        high_stations = filtered_hydro[filtered_hydro['water_level'] > high_threshold]
-        low_stations = filtered_hydro[filtered_hydro['water_level'] < low_threshold]
+        # Threshold filtering happens at gold time (nation-wide 10th/90th
+        # percentiles); the dashboard just renders the tiny tables
+        alert_cols = ['station_name', 'province', 'water_level']
+        high_stations = load_alert_table('gold/hydro_alerts/hydro_alerts_high.parquet', alert_cols)
+        low_stations = load_alert_table('gold/hydro_alerts/hydro_alerts_low.parquet', alert_cols)
+        if selected_province != 'All':
+            high_stations = high_stations[high_stations['province'] == selected_province]
+            low_stations = low_stations[low_stations['province'] == selected_province]
         
         col1, col2 = st.columns(2)
         
@@ -646,10 +779,7 @@ with tab2:
             if not high_stations.empty:
                 st.warning(f"⚠️ **{len(high_stations)} stations** reporting high water levels (top 10%)")
                 with st.expander("View high water stations"):
-                    st.dataframe(
-                        high_stations[['station_name', 'province', 'water_level']].sort_values('water_level', ascending=False).head(10),
-                        hide_index=True
-                    )
+                    st.dataframe(high_stations.head(10), hide_index=True)
             else:
                 st.success("No high water warnings")
         
@@ -657,10 +787,7 @@ with tab2:
             if not low_stations.empty:
                 st.info(f"ℹ️ **{len(low_stations)} stations** reporting low water levels (bottom 10%)")
                 with st.expander("View low water stations"):
-                    st.dataframe(
-                        low_stations[['station_name', 'province', 'water_level']].sort_values('water_level').head(10),
-                        hide_index=True
-                    )
+                    st.dataframe(low_stations.head(10), hide_index=True)
             else:
                 st.success("No low water warnings")
 
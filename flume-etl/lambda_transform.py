@@ -1,204 +1,360 @@
+import gzip
 import json
+import urllib.parse
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime
 import boto3
 import io
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+# orjson parses the multi-MB GeoJSON bodies several times faster than the
+# stdlib; fall back silently when it isn't on the layer. stdlib json stays
+# for the small response/log dumps.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Stream-parse objects bigger than this instead of buffering them whole
+_STREAM_PARSE_BYTES = 32 * 1024 * 1024
 
 # S3 client
-s3_client = boto3.client('s3')
+# Shared client with a pool sized for the multipart transfer threads;
+# adaptive retries back off under S3 throttling instead of hammering it
+_S3_CFG = Config(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive'}
+)
+s3_client = boto3.client('s3', config=_S3_CFG)
+
+# Multipart settings for the parquet PUT: big outputs upload as concurrent
+# 16MB parts, small ones as a single streamed put
+_TRANSFER_CFG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
+
+def _read_features(body, content_length):
+    """Parse the 'features' array from an S3 body, streaming when large"""
+    # Past the threshold, ijson walks the stream feature-by-feature so the
+    # raw bytes are never resident alongside the parsed records — on small
+    # Lambda memory configs the full .read() doubles peak usage. Small
+    # bodies take the one-shot fast parser.
+    if ijson is not None and content_length > _STREAM_PARSE_BYTES:
+        return list(ijson.items(body, 'features.item'))
+    return _json_loads(body.read())['features']
 
 # ============================================================
-# DERIVED METRICS (Same as before)
+# DERIVED METRICS (vectorized over whole columns)
 # ============================================================
 
-def calculate_feels_like(temp_c, humidity, wind_speed_kmh):
-    if temp_c is None or pd.isna(temp_c):
-        return None
+def _wind_chill_formula(temp_c, wind_speed_kmh):
+    wind_pow = np.power(wind_speed_kmh, 0.16)
+    wc = 13.12 + 0.6215 * temp_c - 11.37 * wind_pow + 0.3965 * temp_c * wind_pow
+    return np.round(wc, 1)
+
+def _heat_index_formula(temp_c, humidity):
+    temp_f = temp_c * 9/5 + 32
+    hi = -42.379 + 2.04901523 * temp_f + 10.14333127 * humidity \
+         - 0.22475541 * temp_f * humidity - 0.00683783 * temp_f**2 \
+         - 0.05481717 * humidity**2 + 0.00122874 * temp_f**2 * humidity \
+         + 0.00085282 * temp_f * humidity**2 - 0.00000199 * temp_f**2 * humidity**2
+    return np.round((hi - 32) * 5/9, 1)
+
+# When numba is on the layer, swap the polynomial kernels for compiled
+# ufuncs: same math, but JIT'd to native code that broadcasts without the
+# intermediate arrays numpy allocates per operator. cache=True persists
+# the compiled code across invocations (set NUMBA_CACHE_DIR=/tmp on
+# Lambda, where the package dir is read-only). Without numba the plain
+# numpy versions above are used unchanged.
+try:
+    from numba import vectorize as _nb_vectorize, float64 as _nb_f64
     
-    if temp_c <= 10 and wind_speed_kmh and wind_speed_kmh > 4.8:
-        return calculate_wind_chill(temp_c, wind_speed_kmh)
+    @_nb_vectorize([_nb_f64(_nb_f64, _nb_f64)], cache=True)
+    def _wind_chill_formula(temp_c, wind_speed_kmh):
+        wind_pow = wind_speed_kmh ** 0.16
+        wc = 13.12 + 0.6215 * temp_c - 11.37 * wind_pow + 0.3965 * temp_c * wind_pow
+        return np.round(wc * 10) / 10
     
-    if temp_c >= 27 and humidity:
-        return calculate_heat_index(temp_c, humidity)
+    @_nb_vectorize([_nb_f64(_nb_f64, _nb_f64)], cache=True)
+    def _heat_index_formula(temp_c, humidity):
+        temp_f = temp_c * 9/5 + 32
+        hi = -42.379 + 2.04901523 * temp_f + 10.14333127 * humidity \
+             - 0.22475541 * temp_f * humidity - 0.00683783 * temp_f**2 \
+             - 0.05481717 * humidity**2 + 0.00122874 * temp_f**2 * humidity \
+             + 0.00085282 * temp_f * humidity**2 - 0.00000199 * temp_f**2 * humidity**2
+        return np.round((hi - 32) * 5/9 * 10) / 10
+except ImportError:
+    pass
+
+def calculate_feels_like(temp_c, humidity, wind_speed_kmh):
+    """
+    Feels-like temperature for whole columns at once: wind chill below
+    10°C with wind, heat index at 27°C+ with humidity, otherwise the air
+    temperature itself (NaN comparisons fall through to it)
+    """
+    temp_c = pd.to_numeric(temp_c, errors='coerce')
+    humidity = pd.to_numeric(humidity, errors='coerce')
+    wind_speed_kmh = pd.to_numeric(wind_speed_kmh, errors='coerce')
     
-    return temp_c
+    wc_mask = (temp_c <= 10) & (wind_speed_kmh > 4.8)
+    hi_mask = (temp_c >= 27) & (humidity != 0)  # NaN != 0, like the scalar truthiness check
+    return np.where(wc_mask, _wind_chill_formula(temp_c, wind_speed_kmh),
+           np.where(hi_mask, _heat_index_formula(temp_c, humidity), temp_c))
 
 def calculate_wind_chill(temp_c, wind_speed_kmh):
-    if temp_c is None or wind_speed_kmh is None:
-        return None
-    if temp_c > 10 or wind_speed_kmh <= 4.8:
-        return temp_c
+    """Wind chill column; out-of-range rows keep the air temperature"""
+    temp_c = pd.to_numeric(temp_c, errors='coerce')
+    wind_speed_kmh = pd.to_numeric(wind_speed_kmh, errors='coerce')
     
-    wc = 13.12 + 0.6215 * temp_c - 11.37 * (wind_speed_kmh ** 0.16) + \
-         0.3965 * temp_c * (wind_speed_kmh ** 0.16)
-    return round(wc, 1)
+    # Mirrors the scalar early-returns: warm or calm rows keep the
+    # temperature even when the other input is missing (NaN compares
+    # False), while in-range rows propagate NaN through the polynomial
+    return np.where((temp_c > 10) | (wind_speed_kmh <= 4.8),
+                    temp_c, _wind_chill_formula(temp_c, wind_speed_kmh))
 
 def calculate_heat_index(temp_c, humidity):
-    if temp_c is None or humidity is None:
-        return None
-    if temp_c < 27:
-        return temp_c
+    """Heat index column; rows below 27°C keep the air temperature"""
+    temp_c = pd.to_numeric(temp_c, errors='coerce')
+    humidity = pd.to_numeric(humidity, errors='coerce')
     
-    temp_f = temp_c * 9/5 + 32
+    return np.where(temp_c < 27, temp_c, _heat_index_formula(temp_c, humidity))
+
+def _swob_derived_metrics(air_temp, rel_hum, wind_speed):
+    """Feels-like, wind chill and heat index with each polynomial run once"""
+    # calculate_feels_like / _wind_chill / _heat_index each re-evaluate
+    # their polynomial; for SWOB all three outputs come from the same two
+    # polynomials, so evaluate those once and select per output
+    t = pd.to_numeric(air_temp, errors='coerce')
+    h = pd.to_numeric(rel_hum, errors='coerce')
+    w = pd.to_numeric(wind_speed, errors='coerce')
     
-    hi = -42.379 + 2.04901523 * temp_f + 10.14333127 * humidity \
-         - 0.22475541 * temp_f * humidity - 0.00683783 * temp_f**2 \
-         - 0.05481717 * humidity**2 + 0.00122874 * temp_f**2 * humidity \
-         + 0.00085282 * temp_f * humidity**2 - 0.00000199 * temp_f**2 * humidity**2
+    wc_poly = _wind_chill_formula(t, w)
+    hi_poly = _heat_index_formula(t, h)
     
-    hi_c = (hi - 32) * 5/9
-    return round(hi_c, 1)
+    wc_mask = (t <= 10) & (w > 4.8)
+    hi_mask = (t >= 27) & (h != 0)
+    feels_like = np.where(wc_mask, wc_poly, np.where(hi_mask, hi_poly, t))
+    wind_chill = np.where((t > 10) | (w <= 4.8), t, wc_poly)
+    heat_index = np.where(t < 27, t, hi_poly)
+    return feels_like, wind_chill, heat_index
 
 # ============================================================
 # TRANSFORMATION FUNCTIONS (Same as before)
 # ============================================================
 
-def transform_climate_hourly(features):
-    records = []
-    
-    for feature in features:
-        props = feature.get('properties', {})
-        geom = feature.get('geometry', {})
-        coords = geom.get('coordinates', [None, None])
-        
-        record = {
-            'station_name': props.get('STATION_NAME'),
-            'climate_identifier': props.get('CLIMATE_IDENTIFIER'),
-            'province_code': props.get('PROVINCE_CODE'),
-            'utc_timestamp': props.get('UTC_DATE'),
-            'local_timestamp': props.get('LOCAL_DATE'),
-            'longitude': coords[0],
-            'latitude': coords[1],
-            'temperature': props.get('TEMP'),
-            'dew_point_temp': props.get('DEW_POINT_TEMP'),
-            'relative_humidity': props.get('RELATIVE_HUMIDITY'),
-            'station_pressure': props.get('STATION_PRESSURE'),
-            'wind_speed': props.get('WIND_SPEED'),
-            'wind_direction': props.get('WIND_DIRECTION'),
-            'precip_amount': props.get('PRECIP_AMOUNT'),
-            'visibility': props.get('VISIBILITY'),
-            'humidex': props.get('HUMIDEX'),
-            'windchill': props.get('WINDCHILL'),
-        }
-        
-        record['feels_like_temp'] = calculate_feels_like(
-            record['temperature'],
-            record['relative_humidity'],
-            record['wind_speed']
-        )
-        
-        records.append(record)
-    
-    df = pd.DataFrame(records)
-    df['utc_timestamp'] = pd.to_datetime(df['utc_timestamp'], utc=True)
-    df['local_timestamp'] = pd.to_datetime(df['local_timestamp'])
-    df['year'] = df['utc_timestamp'].dt.year
-    df['month'] = df['utc_timestamp'].dt.month
-    df['day'] = df['utc_timestamp'].dt.day
-    
+# Measurement columns worth narrowing to float32 before the parquet
+# write: halves the frame footprint and the bytes shipped to S3
+_CLIMATE_FLOATS = (
+    'longitude', 'latitude', 'temperature', 'dew_point_temp',
+    'relative_humidity', 'station_pressure', 'wind_speed',
+    'wind_direction', 'precip_amount', 'visibility', 'humidex',
+    'windchill', 'feels_like_temp',
+)
+_SWOB_FLOATS = (
+    'longitude', 'latitude', 'elevation', 'air_temp', 'rel_hum',
+    'stn_pres', 'wind_speed', 'wind_direction', 'dew_point_temp',
+    'precip_amount_1hr', 'snow_depth', 'feels_like_temp', 'wind_chill',
+    'heat_index',
+)
+_HYDRO_FLOATS = ('longitude', 'latitude', 'water_level', 'discharge')
+
+def _downcast(df, float_cols):
+    """Narrow measurements to float32 and partition columns to int16/int8"""
+    for col in float_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+    # dt.year turns float when any timestamp failed to parse; keep the
+    # partition columns wide in that (broken-input) case rather than raise
+    if not df['year'].hasnans:
+        df['year'] = df['year'].astype('int16')
+        df['month'] = df['month'].astype('int8')
+        df['day'] = df['day'].astype('int8')
     return df
 
-def transform_swob(features):
-    records = []
-    
-    for feature in features:
-        props = feature.get('properties', {})
-        geom = feature.get('geometry', {})
-        coords = geom.get('coordinates', [None, None, None])
-        
-        record = {
-            'station_name': props.get('stn_nam-value'),
-            'station_id': props.get('tc_id-value'),
-            'msc_id': props.get('msc_id-value'),
-            'climate_id': props.get('clim_id-value'),
-            'utc_timestamp': props.get('date_tm-value'),
-            'longitude': coords[0],
-            'latitude': coords[1],
-            'elevation': coords[2] if len(coords) > 2 else None,
-            'air_temp': props.get('air_temp'),
-            'air_temp_qa': props.get('air_temp-qa'),
-            'rel_hum': props.get('rel_hum'),
-            'rel_hum_qa': props.get('rel_hum-qa'),
-            'stn_pres': props.get('stn_pres'),
-            'stn_pres_qa': props.get('stn_pres-qa'),
-            'wind_speed': props.get('avg_wnd_spd_10m_pst1mt'),
-            'wind_speed_qa': props.get('avg_wnd_spd_10m_pst1mt-qa'),
-            'wind_direction': props.get('avg_wnd_dir_10m_pst1mt'),
-            'dew_point_temp': props.get('dwpt_temp'),
-            'precip_amount_1hr': props.get('pcpn_amt_pst1hr'),
-            'snow_depth': props.get('snw_dpth'),
-        }
-        
-        record['feels_like_temp'] = calculate_feels_like(
-            record['air_temp'],
-            record['rel_hum'],
-            record['wind_speed']
-        )
-        
-        record['wind_chill'] = calculate_wind_chill(
-            record['air_temp'],
-            record['wind_speed']
-        )
-        
-        record['heat_index'] = calculate_heat_index(
-            record['air_temp'],
-            record['rel_hum']
+# properties.* source → silver column, one map per feed
+_CLIMATE_COLUMNS = {
+    'properties.STATION_NAME': 'station_name',
+    'properties.CLIMATE_IDENTIFIER': 'climate_identifier',
+    'properties.PROVINCE_CODE': 'province_code',
+    'properties.UTC_DATE': 'utc_timestamp',
+    'properties.LOCAL_DATE': 'local_timestamp',
+    'properties.TEMP': 'temperature',
+    'properties.DEW_POINT_TEMP': 'dew_point_temp',
+    'properties.RELATIVE_HUMIDITY': 'relative_humidity',
+    'properties.STATION_PRESSURE': 'station_pressure',
+    'properties.WIND_SPEED': 'wind_speed',
+    'properties.WIND_DIRECTION': 'wind_direction',
+    'properties.PRECIP_AMOUNT': 'precip_amount',
+    'properties.VISIBILITY': 'visibility',
+    'properties.HUMIDEX': 'humidex',
+    'properties.WINDCHILL': 'windchill',
+}
+
+_SWOB_COLUMNS = {
+    'properties.stn_nam-value': 'station_name',
+    'properties.tc_id-value': 'station_id',
+    'properties.msc_id-value': 'msc_id',
+    'properties.clim_id-value': 'climate_id',
+    'properties.date_tm-value': 'utc_timestamp',
+    'properties.air_temp': 'air_temp',
+    'properties.air_temp-qa': 'air_temp_qa',
+    'properties.rel_hum': 'rel_hum',
+    'properties.rel_hum-qa': 'rel_hum_qa',
+    'properties.stn_pres': 'stn_pres',
+    'properties.stn_pres-qa': 'stn_pres_qa',
+    'properties.avg_wnd_spd_10m_pst1mt': 'wind_speed',
+    'properties.avg_wnd_spd_10m_pst1mt-qa': 'wind_speed_qa',
+    'properties.avg_wnd_dir_10m_pst1mt': 'wind_direction',
+    'properties.dwpt_temp': 'dew_point_temp',
+    'properties.pcpn_amt_pst1hr': 'precip_amount_1hr',
+    'properties.snw_dpth': 'snow_depth',
+}
+
+_HYDRO_COLUMNS = {
+    'properties.STATION_NUMBER': 'station_number',
+    'properties.STATION_NAME': 'station_name',
+    'properties.PROV_TERR_STATE_LOC': 'province',
+    'properties.DATETIME': 'utc_timestamp',
+    'properties.DATETIME_LST': 'local_timestamp',
+    'properties.LEVEL': 'water_level',
+    'properties.DISCHARGE': 'discharge',
+    'properties.LEVEL_SYMBOL_EN': 'level_quality_symbol',
+    'properties.DISCHARGE_SYMBOL_EN': 'discharge_quality_symbol',
+}
+
+# Compiled per-feed extractors: each column map specializes, on first
+# use, into a flat function returning one tuple of .get() results — no
+# per-row dict building and no generic recursion over the many unmapped
+# aggregate fields in the raw properties
+_EXTRACTORS = {}
+
+def _extractor_for(column_map):
+    fn = _EXTRACTORS.get(id(column_map))
+    if fn is None:
+        gets = ', '.join(
+            'p.get(%r)' % key.removeprefix('properties.') for key in column_map
         )
-        
-        records.append(record)
+        namespace = {}
+        exec('def _extract(p):\n    return (%s,)' % gets, namespace)
+        fn = _EXTRACTORS[id(column_map)] = namespace['_extract']
+    return fn
+
+def _normalize_features(features, column_map, with_elevation=False):
+    """Extract silver columns from GeoJSON features with a compiled getter"""
+    extract = _extractor_for(column_map)
+    rows = [extract(f.get('properties') or {}) for f in features]
+    columns = zip(*rows) if rows else ((),) * len(column_map)
+    df = pd.DataFrame({
+        name: list(col) for name, col in zip(column_map.values(), columns)
+    })
     
-    df = pd.DataFrame(records)
-    df['utc_timestamp'] = pd.to_datetime(df['utc_timestamp'], utc=True)
-    df['year'] = df['utc_timestamp'].dt.year
-    df['month'] = df['utc_timestamp'].dt.month
-    df['day'] = df['utc_timestamp'].dt.day
+    coords = [(f.get('geometry') or {}).get('coordinates') for f in features]
+    coords = [c if isinstance(c, (list, tuple)) else () for c in coords]
+    df['longitude'] = [c[0] if len(c) > 0 else None for c in coords]
+    df['latitude'] = [c[1] if len(c) > 1 else None for c in coords]
+    if with_elevation:
+        df['elevation'] = [c[2] if len(c) > 2 else None for c in coords]
     
     return df
 
-def transform_hydrometric(features):
-    records = []
+def _parse_timestamps(values, utc=False):
+    """Parse a timestamp string column with Arrow's native ISO parser"""
+    # Single C-level pass with no per-row Python fallback; anything Arrow
+    # can't digest drops back to pandas' parser
+    try:
+        arr = pa.array(values, from_pandas=True)
+        if not utc:
+            return arr.cast(pa.timestamp('us')).to_pandas()
+        try:
+            parsed = arr.cast(pa.timestamp('us', tz='UTC'))
+        except pa.ArrowInvalid:
+            # Zone-less strings (the climate feed's UTC_DATE): parse naive,
+            # then stamp them as UTC
+            parsed = pa.compute.assume_timezone(arr.cast(pa.timestamp('us')), 'UTC')
+        return parsed.to_pandas()
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return pd.to_datetime(values, utc=utc)
+
+def _partition_columns(ts):
+    """Derive year/month/day partition columns in one timestamp pass"""
+    # Plain datetime64 unit casts: month/year boundaries fall out of
+    # integer arithmetic instead of three .dt accessor traversals. Batches
+    # with unparseable timestamps fall back to the accessors, since NaT
+    # has no integer representation (partition columns stay wide there).
+    if ts.isna().any():
+        return ts.dt.year, ts.dt.month, ts.dt.day
+    arr = ts.dt.tz_localize(None).to_numpy() if ts.dt.tz is not None else ts.to_numpy()
+    months = arr.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]')
+    year = years.astype('int64') + 1970
+    month = (months - years.astype('datetime64[M]')).astype('int64') + 1
+    day = (arr.astype('datetime64[D]') - months.astype('datetime64[D]')).astype('int64') + 1
+    return year.astype('int16'), month.astype('int8'), day.astype('int8')
+
+def transform_climate_hourly(features):
+    df = _normalize_features(features, _CLIMATE_COLUMNS)
+    # Derived metrics in one vectorized pass instead of per-record calls
+    df['feels_like_temp'] = calculate_feels_like(
+        df['temperature'], df['relative_humidity'], df['wind_speed']
+    )
+    df['utc_timestamp'] = _parse_timestamps(df['utc_timestamp'], utc=True)
+    df['local_timestamp'] = _parse_timestamps(df['local_timestamp'])
+    df['year'], df['month'], df['day'] = _partition_columns(df['utc_timestamp'])
     
-    for feature in features:
-        props = feature.get('properties', {})
-        geom = feature.get('geometry', {})
-        coords = geom.get('coordinates', [None, None])
-        
-        record = {
-            'station_number': props.get('STATION_NUMBER'),
-            'station_name': props.get('STATION_NAME'),
-            'province': props.get('PROV_TERR_STATE_LOC'),
-            'utc_timestamp': props.get('DATETIME'),
-            'local_timestamp': props.get('DATETIME_LST'),
-            'longitude': coords[0],
-            'latitude': coords[1],
-            'water_level': props.get('LEVEL'),
-            'discharge': props.get('DISCHARGE'),
-            'level_quality_symbol': props.get('LEVEL_SYMBOL_EN'),
-            'discharge_quality_symbol': props.get('DISCHARGE_SYMBOL_EN'),
-        }
-        
-        records.append(record)
+    return _downcast(df, _CLIMATE_FLOATS)
+
+def transform_swob(features):
+    df = _normalize_features(features, _SWOB_COLUMNS, with_elevation=True)
+    # All three derived metrics from one call, sharing the polynomial
+    # evaluations instead of repeating them per metric
+    feels_like, wind_chill, heat_index = _swob_derived_metrics(
+        df['air_temp'], df['rel_hum'], df['wind_speed']
+    )
+    df['feels_like_temp'] = feels_like
+    df['wind_chill'] = wind_chill
+    df['heat_index'] = heat_index
+    df['utc_timestamp'] = _parse_timestamps(df['utc_timestamp'], utc=True)
+    df['year'], df['month'], df['day'] = _partition_columns(df['utc_timestamp'])
     
-    df = pd.DataFrame(records)
-    df['utc_timestamp'] = pd.to_datetime(df['utc_timestamp'], utc=True)
-    df['local_timestamp'] = pd.to_datetime(df['local_timestamp'])
-    df['year'] = df['utc_timestamp'].dt.year
-    df['month'] = df['utc_timestamp'].dt.month
-    df['day'] = df['utc_timestamp'].dt.day
+    return _downcast(df, _SWOB_FLOATS)
+
+def transform_hydrometric(features):
+    df = _normalize_features(features, _HYDRO_COLUMNS)
+    df['utc_timestamp'] = _parse_timestamps(df['utc_timestamp'], utc=True)
+    df['local_timestamp'] = _parse_timestamps(df['local_timestamp'])
+    df['year'], df['month'], df['day'] = _partition_columns(df['utc_timestamp'])
     
-    return df
+    return _downcast(df, _HYDRO_FLOATS)
 
 # ============================================================
 # LAMBDA HANDLER
 # ============================================================
 
+# (path marker, transform, silver prefix) — built once at import so warm
+# invocations skip the per-call branching setup
+DATASET_DISPATCH = (
+    ('swob_raw', transform_swob, 'swob_silver'),
+    ('climate_hourly_raw', transform_climate_hourly, 'climate_hourly_silver'),
+    ('hydrometric_raw', transform_hydrometric, 'hydrometric_silver'),
+)
+
 def lambda_handler(event, context):
     """
     Lambda entry point - triggered by S3 file upload
     """
-    import urllib.parse  # Add this import
-    
     print("Lambda triggered!")
     print(f"Event: {json.dumps(event)}")
     
@@ -210,18 +366,9 @@ def lambda_handler(event, context):
     print(f"Processing: s3://{bucket}/{input_key}")
     
     # Determine dataset type from path
-    if 'swob_raw' in input_key:
-        dataset_type = 'swob'
-        transform_func = transform_swob
-        output_prefix = 'swob_silver'
-    elif 'climate_hourly_raw' in input_key:
-        dataset_type = 'climate_hourly'
-        transform_func = transform_climate_hourly
-        output_prefix = 'climate_hourly_silver'
-    elif 'hydrometric_raw' in input_key:
-        dataset_type = 'hydrometric'
-        transform_func = transform_hydrometric
-        output_prefix = 'hydrometric_silver'
+    for marker, transform_func, output_prefix in DATASET_DISPATCH:
+        if marker in input_key:
+            break
     else:
         print(f"Unknown dataset type in path: {input_key}")
         return {'statusCode': 400, 'body': 'Unknown dataset'}
@@ -229,8 +376,19 @@ def lambda_handler(event, context):
     try:
         # Read JSON from S3
         obj = s3_client.get_object(Bucket=bucket, Key=input_key)
-        data = json.loads(obj['Body'].read())
-        features = data['features']
+        body = obj['Body']
+        base_key = input_key
+        if input_key.endswith('.gz'):
+            # Producer deltas arrive gzip-compressed; wrapping the stream
+            # keeps the large-body path parsing incrementally
+            body = gzip.GzipFile(fileobj=body)
+            base_key = input_key[:-3]
+        if base_key.endswith('.ndjson'):
+            # One feature per line — parsed incrementally, no wrapping
+            # document
+            features = [_json_loads(line) for line in body if line.strip()]
+        else:
+            features = _read_features(body, obj['ContentLength'])
         print(f"Loaded {len(features)} features")
         
         # Transform
@@ -239,14 +397,32 @@ def lambda_handler(event, context):
         
         # Generate output key
         parts = input_key.split('/')
-        filename = parts[-1].replace('.json', '.parquet').replace('_delta', '')
+        filename = parts[-1]
+        if filename.endswith('.gz'):
+            filename = filename[:-3]
+        filename = filename.replace('.ndjson', '.json') \
+                           .replace('.json', '.parquet').replace('_delta', '')
         output_key = f"{output_prefix}/{'/'.join(parts[-4:-1])}/{filename}"
         
-        # Write Parquet to S3
+        # Write Parquet to S3 via an explicit Arrow table: dictionary
+        # encoding shrinks the repeated station/province strings and the
+        # page statistics give downstream readers predicate pushdown
         buffer = io.BytesIO()
-        df.to_parquet(buffer, index=False, compression='snappy', engine='pyarrow')
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(
+            table,
+            buffer,
+            compression='zstd',
+            compression_level=3,
+            use_dictionary=True,
+            write_statistics=True,
+            data_page_size=1 << 20
+        )
         buffer.seek(0)
-        s3_client.put_object(Bucket=bucket, Key=output_key, Body=buffer.getvalue())
+        # Stream the seeked buffer instead of copying it out with
+        # getvalue() — on Lambda the serialized blob would otherwise sit
+        # in memory twice during the send
+        s3_client.upload_fileobj(buffer, bucket, output_key, Config=_TRANSFER_CFG)
         
         print(f"✓ Wrote {len(df)} records to s3://{bucket}/{output_key}")
         
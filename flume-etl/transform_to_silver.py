@@ -3,13 +3,35 @@
 PROJECT FLUME - Bronze to Silver Transformation
 Cleans raw JSON and converts to Parquet with derived metrics
 """
+import gzip
 import json
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import boto3
 import io
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+# orjson parses the multi-MB GeoJSON bodies several times faster than the
+# stdlib; fall back silently when it isn't installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Stream-parse objects bigger than this instead of buffering them whole
+_STREAM_PARSE_BYTES = 32 * 1024 * 1024
 
 # Configuration
 S3_BUCKET = "project-nimbus-raw-data-lake-12345-raj"
@@ -24,121 +46,323 @@ SILVER_PREFIX = {
     "hydro": "hydrometric_silver"
 }
 
-s3_client = boto3.client('s3')
+# The pool size must cover the transform worker threads or they serialize
+# on connection checkout
+# Pool sized past the two thread pools below so parallel GETs and PUTs
+# reuse warm TLS connections instead of queueing on botocore's default 10
+_S3_CFG = Config(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive'}
+)
+s3_client = boto3.client('s3', config=_S3_CFG)
+
+# Multipart settings for the parquet PUTs: files past 8MB upload as
+# concurrent 16MB parts instead of one serial put_object
+_TRANSFER_CFG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True
+)
 
 # ============================================================
-# DERIVED METRICS CALCULATIONS
+# DERIVED METRICS CALCULATIONS (vectorized over whole columns)
 # ============================================================
 
+def _wind_chill_formula(temp_c, wind_speed_kmh):
+    wind_pow = np.power(wind_speed_kmh, 0.16)
+    wc = 13.12 + 0.6215 * temp_c - 11.37 * wind_pow + 0.3965 * temp_c * wind_pow
+    return np.round(wc, 1)
+
+def _heat_index_formula(temp_c, humidity):
+    temp_f = temp_c * 9/5 + 32
+    hi = -42.379 + 2.04901523 * temp_f + 10.14333127 * humidity \
+         - 0.22475541 * temp_f * humidity - 0.00683783 * temp_f**2 \
+         - 0.05481717 * humidity**2 + 0.00122874 * temp_f**2 * humidity \
+         + 0.00085282 * temp_f * humidity**2 - 0.00000199 * temp_f**2 * humidity**2
+    return np.round((hi - 32) * 5/9, 1)
+
 def calculate_feels_like(temp_c, humidity, wind_speed_kmh):
     """
-    Calculate feels-like temperature using wind chill or heat index
+    Feels-like temperature for whole columns at once: wind chill below
+    10°C with wind, heat index at 27°C+ with humidity, otherwise the air
+    temperature itself (NaN comparisons fall through to it)
     """
-    if temp_c is None or pd.isna(temp_c):
-        return None
+    temp_c = pd.to_numeric(temp_c, errors='coerce')
+    humidity = pd.to_numeric(humidity, errors='coerce')
+    wind_speed_kmh = pd.to_numeric(wind_speed_kmh, errors='coerce')
     
-    # If cold (<=10°C) and windy, use wind chill
-    if temp_c <= 10 and wind_speed_kmh and wind_speed_kmh > 4.8:
-        return calculate_wind_chill(temp_c, wind_speed_kmh)
-    
-    # If hot (>=27°C) and humid, use heat index
-    if temp_c >= 27 and humidity:
-        return calculate_heat_index(temp_c, humidity)
-    
-    # Otherwise feels-like = actual temp
-    return temp_c
+    wc_mask = (temp_c <= 10) & (wind_speed_kmh > 4.8)
+    hi_mask = (temp_c >= 27) & (humidity != 0)  # NaN != 0, like the scalar truthiness check
+    return np.where(wc_mask, _wind_chill_formula(temp_c, wind_speed_kmh),
+           np.where(hi_mask, _heat_index_formula(temp_c, humidity), temp_c))
 
 def calculate_wind_chill(temp_c, wind_speed_kmh):
-    """
-    Wind chill index (Environment Canada formula)
-    Valid for temps <= 10°C and wind > 4.8 km/h
-    """
-    if temp_c is None or wind_speed_kmh is None:
-        return None
-    if temp_c > 10 or wind_speed_kmh <= 4.8:
-        return temp_c
+    """Wind chill column; out-of-range rows keep the air temperature"""
+    temp_c = pd.to_numeric(temp_c, errors='coerce')
+    wind_speed_kmh = pd.to_numeric(wind_speed_kmh, errors='coerce')
     
-    wc = 13.12 + 0.6215 * temp_c - 11.37 * (wind_speed_kmh ** 0.16) + \
-         0.3965 * temp_c * (wind_speed_kmh ** 0.16)
-    return round(wc, 1)
+    # Mirrors the scalar early-returns: warm or calm rows keep the
+    # temperature even when the other input is missing (NaN compares
+    # False), while in-range rows propagate NaN through the polynomial
+    return np.where((temp_c > 10) | (wind_speed_kmh <= 4.8),
+                    temp_c, _wind_chill_formula(temp_c, wind_speed_kmh))
 
 def calculate_heat_index(temp_c, humidity):
-    """
-    Heat index (US formula adapted for Celsius)
-    Valid for temps >= 27°C
-    """
-    if temp_c is None or humidity is None:
-        return None
-    if temp_c < 27:
-        return temp_c
+    """Heat index column; rows below 27°C keep the air temperature"""
+    temp_c = pd.to_numeric(temp_c, errors='coerce')
+    humidity = pd.to_numeric(humidity, errors='coerce')
     
-    # Convert to Fahrenheit for formula
-    temp_f = temp_c * 9/5 + 32
+    return np.where(temp_c < 27, temp_c, _heat_index_formula(temp_c, humidity))
+
+def _swob_derived_metrics(air_temp, rel_hum, wind_speed):
+    """Feels-like, wind chill and heat index with each polynomial run once"""
+    # calculate_feels_like / _wind_chill / _heat_index each re-evaluate
+    # their polynomial; for SWOB all three outputs come from the same two
+    # polynomials, so evaluate those once and select per output
+    t = pd.to_numeric(air_temp, errors='coerce')
+    h = pd.to_numeric(rel_hum, errors='coerce')
+    w = pd.to_numeric(wind_speed, errors='coerce')
     
-    hi = -42.379 + 2.04901523 * temp_f + 10.14333127 * humidity \
-         - 0.22475541 * temp_f * humidity - 0.00683783 * temp_f**2 \
-         - 0.05481717 * humidity**2 + 0.00122874 * temp_f**2 * humidity \
-         + 0.00085282 * temp_f * humidity**2 - 0.00000199 * temp_f**2 * humidity**2
+    wc_poly = _wind_chill_formula(t, w)
+    hi_poly = _heat_index_formula(t, h)
     
-    # Convert back to Celsius
-    hi_c = (hi - 32) * 5/9
-    return round(hi_c, 1)
+    wc_mask = (t <= 10) & (w > 4.8)
+    hi_mask = (t >= 27) & (h != 0)
+    feels_like = np.where(wc_mask, wc_poly, np.where(hi_mask, hi_poly, t))
+    wind_chill = np.where((t > 10) | (w <= 4.8), t, wc_poly)
+    heat_index = np.where(t < 27, t, hi_poly)
+    return feels_like, wind_chill, heat_index
+
+# With numba installed, the three metric passes fuse into one parallel
+# traversal of the measurement arrays — each element is loaded once and
+# all branches evaluated in registers across cores. The numpy fallback
+# above computes the same values in three vectorized passes.
+try:
+    from numba import njit as _njit, prange as _prange
+    
+    @_njit(parallel=True, cache=True)
+    def _swob_derived_kernel(temp, hum, wind):
+        n = temp.shape[0]
+        feels = np.empty(n)
+        wc = np.empty(n)
+        hi = np.empty(n)
+        for i in _prange(n):
+            t = temp[i]
+            h = hum[i]
+            w = wind[i]
+            
+            # Branch order mirrors the scalar originals: out-of-range
+            # comparisons (False for NaN) fall back to the temperature,
+            # in-range rows with a missing input propagate NaN
+            if t > 10.0 or w <= 4.8:
+                wc[i] = t
+            elif np.isnan(t) or np.isnan(w):
+                wc[i] = np.nan
+            else:
+                wp = w ** 0.16
+                wc[i] = round((13.12 + 0.6215 * t - 11.37 * wp + 0.3965 * t * wp) * 10) / 10
+            
+            if t < 27.0:
+                hi[i] = t
+            elif np.isnan(t) or np.isnan(h):
+                hi[i] = np.nan
+            else:
+                tf = t * 9 / 5 + 32
+                raw = -42.379 + 2.04901523 * tf + 10.14333127 * h \
+                      - 0.22475541 * tf * h - 0.00683783 * tf ** 2 \
+                      - 0.05481717 * h ** 2 + 0.00122874 * tf ** 2 * h \
+                      + 0.00085282 * tf * h ** 2 - 0.00000199 * tf ** 2 * h ** 2
+                hi[i] = round((raw - 32) * 5 / 9 * 10) / 10
+            
+            if t <= 10.0 and w > 4.8:
+                feels[i] = wc[i]
+            elif t >= 27.0 and h != 0.0:  # NaN != 0, like the scalar truthiness check
+                feels[i] = hi[i]
+            else:
+                feels[i] = t
+        return feels, wc, hi
+    
+    def _swob_derived_metrics(air_temp, rel_hum, wind_speed):
+        """Feels-like, wind chill and heat index in one fused parallel pass"""
+        return _swob_derived_kernel(
+            pd.to_numeric(air_temp, errors='coerce').to_numpy(dtype='float64'),
+            pd.to_numeric(rel_hum, errors='coerce').to_numpy(dtype='float64'),
+            pd.to_numeric(wind_speed, errors='coerce').to_numpy(dtype='float64')
+        )
+except ImportError:
+    pass
 
 # ============================================================
-# CLIMATE-HOURLY TRANSFORMATION
+# FEATURE PARSING
 # ============================================================
 
+# Measurement columns worth narrowing to float32 before the parquet
+# write: halves the frame footprint and the bytes shipped to S3
+_CLIMATE_FLOATS = (
+    'longitude', 'latitude', 'temperature', 'dew_point_temp',
+    'relative_humidity', 'station_pressure', 'wind_speed',
+    'wind_direction', 'precip_amount', 'visibility', 'humidex',
+    'windchill', 'feels_like_temp',
+)
+_SWOB_FLOATS = (
+    'longitude', 'latitude', 'elevation', 'air_temp', 'rel_hum',
+    'stn_pres', 'wind_speed', 'wind_direction', 'dew_point_temp',
+    'precip_amount_1hr', 'snow_depth', 'feels_like_temp', 'wind_chill',
+    'heat_index',
+)
+_HYDRO_FLOATS = ('longitude', 'latitude', 'water_level', 'discharge')
+
+def _downcast(df, float_cols):
+    """Narrow measurements to float32 and partition columns to int16/int8"""
+    for col in float_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+    # dt.year turns float when any timestamp failed to parse; keep the
+    # partition columns wide in that (broken-input) case rather than raise
+    if not df['year'].hasnans:
+        df['year'] = df['year'].astype('int16')
+        df['month'] = df['month'].astype('int8')
+        df['day'] = df['day'].astype('int8')
+    return df
+
+# properties.* source → silver column, one map per feed
+_CLIMATE_COLUMNS = {
+    'properties.STATION_NAME': 'station_name',
+    'properties.CLIMATE_IDENTIFIER': 'climate_identifier',
+    'properties.PROVINCE_CODE': 'province_code',
+    'properties.UTC_DATE': 'utc_timestamp',
+    'properties.LOCAL_DATE': 'local_timestamp',
+    'properties.TEMP': 'temperature',
+    'properties.DEW_POINT_TEMP': 'dew_point_temp',
+    'properties.RELATIVE_HUMIDITY': 'relative_humidity',
+    'properties.STATION_PRESSURE': 'station_pressure',
+    'properties.WIND_SPEED': 'wind_speed',
+    'properties.WIND_DIRECTION': 'wind_direction',
+    'properties.PRECIP_AMOUNT': 'precip_amount',
+    'properties.VISIBILITY': 'visibility',
+    'properties.HUMIDEX': 'humidex',
+    'properties.WINDCHILL': 'windchill',
+}
+
+_SWOB_COLUMNS = {
+    'properties.stn_nam-value': 'station_name',
+    'properties.tc_id-value': 'station_id',
+    'properties.msc_id-value': 'msc_id',
+    'properties.clim_id-value': 'climate_id',
+    'properties.date_tm-value': 'utc_timestamp',
+    'properties.air_temp': 'air_temp',
+    'properties.air_temp-qa': 'air_temp_qa',
+    'properties.rel_hum': 'rel_hum',
+    'properties.rel_hum-qa': 'rel_hum_qa',
+    'properties.stn_pres': 'stn_pres',
+    'properties.stn_pres-qa': 'stn_pres_qa',
+    'properties.avg_wnd_spd_10m_pst1mt': 'wind_speed',
+    'properties.avg_wnd_spd_10m_pst1mt-qa': 'wind_speed_qa',
+    'properties.avg_wnd_dir_10m_pst1mt': 'wind_direction',
+    'properties.dwpt_temp': 'dew_point_temp',
+    'properties.pcpn_amt_pst1hr': 'precip_amount_1hr',
+    'properties.snw_dpth': 'snow_depth',
+}
+
+_HYDRO_COLUMNS = {
+    'properties.STATION_NUMBER': 'station_number',
+    'properties.STATION_NAME': 'station_name',
+    'properties.PROV_TERR_STATE_LOC': 'province',
+    'properties.DATETIME': 'utc_timestamp',
+    'properties.DATETIME_LST': 'local_timestamp',
+    'properties.LEVEL': 'water_level',
+    'properties.DISCHARGE': 'discharge',
+    'properties.LEVEL_SYMBOL_EN': 'level_quality_symbol',
+    'properties.DISCHARGE_SYMBOL_EN': 'discharge_quality_symbol',
+}
+
+# Compiled per-feed extractors: each column map specializes, on first
+# use, into a flat function returning one tuple of .get() results — no
+# per-row dict building and no generic recursion over the many unmapped
+# aggregate fields in the raw properties
+_EXTRACTORS = {}
+
+def _extractor_for(column_map):
+    fn = _EXTRACTORS.get(id(column_map))
+    if fn is None:
+        gets = ', '.join(
+            'p.get(%r)' % key.removeprefix('properties.') for key in column_map
+        )
+        namespace = {}
+        exec('def _extract(p):\n    return (%s,)' % gets, namespace)
+        fn = _EXTRACTORS[id(column_map)] = namespace['_extract']
+    return fn
+
+def _normalize_features(features, column_map, with_elevation=False):
+    """Extract silver columns from GeoJSON features with a compiled getter"""
+    extract = _extractor_for(column_map)
+    rows = [extract(f.get('properties') or {}) for f in features]
+    columns = zip(*rows) if rows else ((),) * len(column_map)
+    df = pd.DataFrame({
+        name: list(col) for name, col in zip(column_map.values(), columns)
+    })
+    
+    coords = [(f.get('geometry') or {}).get('coordinates') for f in features]
+    coords = [c if isinstance(c, (list, tuple)) else () for c in coords]
+    df['longitude'] = [c[0] if len(c) > 0 else None for c in coords]
+    df['latitude'] = [c[1] if len(c) > 1 else None for c in coords]
+    if with_elevation:
+        df['elevation'] = [c[2] if len(c) > 2 else None for c in coords]
+    
+    return df
+
+def _parse_timestamps(values, utc=False):
+    """Parse a timestamp string column with Arrow's native ISO parser"""
+    # Single C-level pass with no per-row Python fallback; anything Arrow
+    # can't digest drops back to pandas' parser
+    try:
+        arr = pa.array(values, from_pandas=True)
+        if not utc:
+            return arr.cast(pa.timestamp('us')).to_pandas()
+        try:
+            parsed = arr.cast(pa.timestamp('us', tz='UTC'))
+        except pa.ArrowInvalid:
+            # Zone-less strings (the climate feed's UTC_DATE): parse naive,
+            # then stamp them as UTC
+            parsed = pa.compute.assume_timezone(arr.cast(pa.timestamp('us')), 'UTC')
+        return parsed.to_pandas()
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return pd.to_datetime(values, utc=utc)
+
+def _partition_columns(ts):
+    """Derive year/month/day partition columns in one timestamp pass"""
+    # Plain datetime64 unit casts: month/year boundaries fall out of
+    # integer arithmetic instead of three .dt accessor traversals. Batches
+    # with unparseable timestamps fall back to the accessors, since NaT
+    # has no integer representation (partition columns stay wide there).
+    if ts.isna().any():
+        return ts.dt.year, ts.dt.month, ts.dt.day
+    arr = ts.dt.tz_localize(None).to_numpy() if ts.dt.tz is not None else ts.to_numpy()
+    months = arr.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]')
+    year = years.astype('int64') + 1970
+    month = (months - years.astype('datetime64[M]')).astype('int64') + 1
+    day = (arr.astype('datetime64[D]') - months.astype('datetime64[D]')).astype('int64') + 1
+    return year.astype('int16'), month.astype('int8'), day.astype('int8')
+
 def transform_climate_hourly(features):
     """Transform Climate-Hourly raw JSON to clean DataFrame"""
-    records = []
-    
-    for feature in features:
-        props = feature.get('properties', {})
-        geom = feature.get('geometry', {})
-        coords = geom.get('coordinates', [None, None])
-        
-        # Extract core fields
-        record = {
-            'station_name': props.get('STATION_NAME'),
-            'climate_identifier': props.get('CLIMATE_IDENTIFIER'),
-            'province_code': props.get('PROVINCE_CODE'),
-            'utc_timestamp': props.get('UTC_DATE'),
-            'local_timestamp': props.get('LOCAL_DATE'),
-            'longitude': coords[0],
-            'latitude': coords[1],
-            'temperature': props.get('TEMP'),
-            'dew_point_temp': props.get('DEW_POINT_TEMP'),
-            'relative_humidity': props.get('RELATIVE_HUMIDITY'),
-            'station_pressure': props.get('STATION_PRESSURE'),
-            'wind_speed': props.get('WIND_SPEED'),
-            'wind_direction': props.get('WIND_DIRECTION'),
-            'precip_amount': props.get('PRECIP_AMOUNT'),
-            'visibility': props.get('VISIBILITY'),
-            'humidex': props.get('HUMIDEX'),
-            'windchill': props.get('WINDCHILL'),
-        }
-        
-        # Calculate feels-like temperature
-        record['feels_like_temp'] = calculate_feels_like(
-            record['temperature'],
-            record['relative_humidity'],
-            record['wind_speed']
-        )
-        
-        records.append(record)
+    df = _normalize_features(features, _CLIMATE_COLUMNS)
     
-    df = pd.DataFrame(records)
+    # Derived metrics in one vectorized pass instead of per-record calls
+    df['feels_like_temp'] = calculate_feels_like(
+        df['temperature'], df['relative_humidity'], df['wind_speed']
+    )
     
     # Convert timestamps
-    df['utc_timestamp'] = pd.to_datetime(df['utc_timestamp'], utc=True)
-    df['local_timestamp'] = pd.to_datetime(df['local_timestamp'])
+    df['utc_timestamp'] = _parse_timestamps(df['utc_timestamp'], utc=True)
+    df['local_timestamp'] = _parse_timestamps(df['local_timestamp'])
     
     # Add partition columns
-    df['year'] = df['utc_timestamp'].dt.year
-    df['month'] = df['utc_timestamp'].dt.month
-    df['day'] = df['utc_timestamp'].dt.day
+    df['year'], df['month'], df['day'] = _partition_columns(df['utc_timestamp'])
     
-    return df
+    return _downcast(df, _CLIMATE_FLOATS)
 
 # ============================================================
 # SWOB TRANSFORMATION
@@ -146,67 +370,24 @@ def transform_climate_hourly(features):
 
 def transform_swob(features):
     """Transform SWOB raw JSON to clean DataFrame"""
-    records = []
+    df = _normalize_features(features, _SWOB_COLUMNS, with_elevation=True)
     
-    for feature in features:
-        props = feature.get('properties', {})
-        geom = feature.get('geometry', {})
-        coords = geom.get('coordinates', [None, None, None])
-        
-        # Extract core fields (drop aggregates like pst1hr, pst10mts)
-        record = {
-            'station_name': props.get('stn_nam-value'),
-            'station_id': props.get('tc_id-value'),
-            'msc_id': props.get('msc_id-value'),
-            'climate_id': props.get('clim_id-value'),
-            'utc_timestamp': props.get('date_tm-value'),
-            'longitude': coords[0],
-            'latitude': coords[1],
-            'elevation': coords[2] if len(coords) > 2 else None,
-            'air_temp': props.get('air_temp'),
-            'air_temp_qa': props.get('air_temp-qa'),
-            'rel_hum': props.get('rel_hum'),
-            'rel_hum_qa': props.get('rel_hum-qa'),
-            'stn_pres': props.get('stn_pres'),
-            'stn_pres_qa': props.get('stn_pres-qa'),
-            'wind_speed': props.get('avg_wnd_spd_10m_pst1mt'),
-            'wind_speed_qa': props.get('avg_wnd_spd_10m_pst1mt-qa'),
-            'wind_direction': props.get('avg_wnd_dir_10m_pst1mt'),
-            'dew_point_temp': props.get('dwpt_temp'),
-            'precip_amount_1hr': props.get('pcpn_amt_pst1hr'),
-            'snow_depth': props.get('snw_dpth'),
-        }
-        
-        # Calculate derived metrics
-        record['feels_like_temp'] = calculate_feels_like(
-            record['air_temp'],
-            record['rel_hum'],
-            record['wind_speed']
-        )
-        
-        record['wind_chill'] = calculate_wind_chill(
-            record['air_temp'],
-            record['wind_speed']
-        )
-        
-        record['heat_index'] = calculate_heat_index(
-            record['air_temp'],
-            record['rel_hum']
-        )
-        
-        records.append(record)
-    
-    df = pd.DataFrame(records)
+    # All three derived metrics from one call (fused parallel kernel when
+    # numba is installed, vectorized numpy passes otherwise)
+    feels_like, wind_chill, heat_index = _swob_derived_metrics(
+        df['air_temp'], df['rel_hum'], df['wind_speed']
+    )
+    df['feels_like_temp'] = feels_like
+    df['wind_chill'] = wind_chill
+    df['heat_index'] = heat_index
     
     # Convert timestamps
-    df['utc_timestamp'] = pd.to_datetime(df['utc_timestamp'], utc=True)
+    df['utc_timestamp'] = _parse_timestamps(df['utc_timestamp'], utc=True)
     
     # Add partition columns
-    df['year'] = df['utc_timestamp'].dt.year
-    df['month'] = df['utc_timestamp'].dt.month
-    df['day'] = df['utc_timestamp'].dt.day
+    df['year'], df['month'], df['day'] = _partition_columns(df['utc_timestamp'])
     
-    return df
+    return _downcast(df, _SWOB_FLOATS)
 
 # ============================================================
 # HYDROMETRIC TRANSFORMATION
@@ -214,79 +395,109 @@ def transform_swob(features):
 
 def transform_hydrometric(features):
     """Transform Hydrometric raw JSON to clean DataFrame"""
-    records = []
-    
-    for feature in features:
-        props = feature.get('properties', {})
-        geom = feature.get('geometry', {})
-        coords = geom.get('coordinates', [None, None])
-        
-        record = {
-            'station_number': props.get('STATION_NUMBER'),
-            'station_name': props.get('STATION_NAME'),
-            'province': props.get('PROV_TERR_STATE_LOC'),
-            'utc_timestamp': props.get('DATETIME'),
-            'local_timestamp': props.get('DATETIME_LST'),
-            'longitude': coords[0],
-            'latitude': coords[1],
-            'water_level': props.get('LEVEL'),
-            'discharge': props.get('DISCHARGE'),
-            'level_quality_symbol': props.get('LEVEL_SYMBOL_EN'),
-            'discharge_quality_symbol': props.get('DISCHARGE_SYMBOL_EN'),
-        }
-        
-        records.append(record)
-    
-    df = pd.DataFrame(records)
+    df = _normalize_features(features, _HYDRO_COLUMNS)
     
     # Convert timestamps
-    df['utc_timestamp'] = pd.to_datetime(df['utc_timestamp'], utc=True)
-    df['local_timestamp'] = pd.to_datetime(df['local_timestamp'])
+    df['utc_timestamp'] = _parse_timestamps(df['utc_timestamp'], utc=True)
+    df['local_timestamp'] = _parse_timestamps(df['local_timestamp'])
     
     # Add partition columns
-    df['year'] = df['utc_timestamp'].dt.year
-    df['month'] = df['utc_timestamp'].dt.month
-    df['day'] = df['utc_timestamp'].dt.day
+    df['year'], df['month'], df['day'] = _partition_columns(df['utc_timestamp'])
     
-    return df
+    return _downcast(df, _HYDRO_FLOATS)
 
 # ============================================================
 # S3 I/O FUNCTIONS
 # ============================================================
 
+def _read_features(body, content_length):
+    """Parse the 'features' array from an S3 body, streaming when large"""
+    # Past the threshold, ijson walks the stream feature-by-feature so the
+    # raw bytes are never resident alongside the parsed records; small
+    # bodies take the one-shot fast parser
+    if ijson is not None and content_length > _STREAM_PARSE_BYTES:
+        return list(ijson.items(body, 'features.item'))
+    return _json_loads(body.read())['features']
+
 def read_json_from_s3(bucket, key):
-    """Read JSON file from S3"""
+    """Read a feature batch (FeatureCollection or NDJSON) from S3"""
     obj = s3_client.get_object(Bucket=bucket, Key=key)
-    data = json.loads(obj['Body'].read())
-    return data['features']
+    body = obj['Body']
+    base_key = key
+    if key.endswith('.gz'):
+        # Producer deltas arrive gzip-compressed; wrapping the stream keeps
+        # the large-body path parsing incrementally
+        body = gzip.GzipFile(fileobj=body)
+        base_key = key[:-3]
+    if base_key.endswith('.ndjson'):
+        # One feature per line — parsed incrementally, no wrapping document
+        return [_json_loads(line) for line in body if line.strip()]
+    return _read_features(body, obj['ContentLength'])
 
 def write_parquet_to_s3(df, bucket, key):
     """Write DataFrame to S3 as Parquet"""
+    # Explicit Arrow table write: dictionary encoding shrinks the repeated
+    # station/province strings and the page statistics give downstream
+    # readers predicate pushdown
     buffer = io.BytesIO()
-    df.to_parquet(buffer, index=False, compression='snappy', engine='pyarrow')
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(
+        table,
+        buffer,
+        compression='zstd',
+        compression_level=3,
+        use_dictionary=True,
+        write_statistics=True,
+        data_page_size=1 << 20
+    )
     buffer.seek(0)
-    s3_client.put_object(Bucket=bucket, Key=key, Body=buffer.getvalue())
+    s3_client.upload_fileobj(buffer, bucket, key, Config=_TRANSFER_CFG)
     print(f"✓ Wrote {len(df)} records to s3://{bucket}/{key}")
 
-def list_files_in_s3(bucket, prefix, extension='.json'):
-    """List all files with given extension in S3 prefix"""
-    files = []
+def list_files_in_s3(bucket, prefix, extensions=('.json', '.ndjson')):
+    """Yield feature-batch keys under an S3 prefix, compressed or not"""
+    # Generator: callers can start working on the first page while later
+    # pages are still listing; full 1000-key pages minimize round-trips
+    suffixes = tuple(ext + gz for ext in extensions for gz in ('', '.gz'))
     paginator = s3_client.get_paginator('list_objects_v2')
-    
-    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-        if 'Contents' not in page:
-            continue
-        for obj in page['Contents']:
-            key = obj['Key']
-            if key.endswith(extension):
-                files.append(key)
-    
-    return files
+
+    for page in paginator.paginate(
+        Bucket=bucket, Prefix=prefix,
+        PaginationConfig={'PageSize': 1000}
+    ):
+        yield from (
+            obj['Key'] for obj in page.get('Contents', ())
+            if obj['Key'].endswith(suffixes)
+        )
 
 # ============================================================
 # MAIN PROCESSING FUNCTION
 # ============================================================
 
+def _transform_one(file_key, transform_func):
+    """Read and transform one bronze file; returns (partition, frame)"""
+    try:
+        features = read_json_from_s3(S3_BUCKET, file_key)
+        df = transform_func(features)
+        # Example: swob_raw/year=2025/month=10/day=04/swob_delta_20251004.json
+        # carries its partition as the middle path segments
+        parts = file_key.split('/')
+        print(f"  ✓ {file_key}: {len(features)} features → {len(df)} records")
+        return '/'.join(parts[-4:-1]), df
+        
+    except Exception as e:
+        print(f"  ✗ ERROR on {file_key}: {e}")
+        return None
+
+def _write_partition(df, output_key):
+    """Write one combined partition file; returns True on success"""
+    try:
+        write_parquet_to_s3(df, S3_BUCKET, output_key)
+        return True
+    except Exception as e:
+        print(f"  ✗ ERROR writing {output_key}: {e}")
+        return False
+
 def process_dataset(dataset_name, transform_func):
     """Process all files for a given dataset"""
     print(f"\n{'='*60}")
@@ -296,42 +507,45 @@ def process_dataset(dataset_name, transform_func):
     bronze_prefix = BRONZE_PREFIX[dataset_name]
     silver_prefix = SILVER_PREFIX[dataset_name]
     
-    # List all raw JSON files
+    # Each file spends most of its wall time waiting on the S3 GET/PUT;
+    # a thread pool overlaps those requests across files (the boto3
+    # client is thread-safe and shares its connection pool). Keys stream
+    # from the lister straight into the pool, so the first transforms
+    # start before the listing finishes.
     files = list_files_in_s3(S3_BUCKET, bronze_prefix)
-    print(f"Found {len(files)} files to process")
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(
+            lambda key: _transform_one(key, transform_func),
+            files
+        ))
     
-    if not files:
+    if not results:
         print(f"⚠️  No files found in s3://{S3_BUCKET}/{bronze_prefix}")
         return
     
-    # Process each file
-    for i, file_key in enumerate(files, 1):
-        print(f"\n[{i}/{len(files)}] Processing: {file_key}")
-        
-        try:
-            # Read raw JSON
-            features = read_json_from_s3(S3_BUCKET, file_key)
-            print(f"  Loaded {len(features)} features")
-            
-            # Transform to DataFrame
-            df = transform_func(features)
-            print(f"  Transformed to {len(df)} records with {len(df.columns)} columns")
-            
-            # Generate output path
-            # Example: swob_raw/year=2025/month=10/day=04/swob_delta_20251004.json
-            # Becomes: swob_silver/year=2025/month=10/day=04/swob_20251004.parquet
-            parts = file_key.split('/')
-            filename = parts[-1].replace('.json', '.parquet').replace('_delta', '')
-            output_key = f"{silver_prefix}/{'/'.join(parts[-4:-1])}/{filename}"
-            
-            # Write Parquet to S3
-            write_parquet_to_s3(df, S3_BUCKET, output_key)
-            
-        except Exception as e:
-            print(f"  ✗ ERROR: {e}")
+    # One output file per (year, month, day) partition instead of one per
+    # input delta: parquet's footer and dictionary overhead are fixed per
+    # file, and fleets of tiny files hurt both readers and S3 PUT counts
+    partitions = {}
+    transformed = 0
+    for result in results:
+        if result is None:
             continue
+        transformed += 1
+        partition, df = result
+        partitions.setdefault(partition, []).append(df)
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        writes = []
+        for partition, frames in partitions.items():
+            combined = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+            ymd = ''.join(segment.split('=')[-1] for segment in partition.split('/'))
+            output_key = f"{silver_prefix}/{partition}/{dataset_name}_{ymd}.parquet"
+            writes.append(executor.submit(_write_partition, combined, output_key))
+        written = sum(write.result() for write in writes)
     
-    print(f"\n✓ Completed {dataset_name.upper()} transformation")
+    print(f"\n✓ Completed {dataset_name.upper()} transformation "
+          f"({transformed}/{len(results)} files → {written} partition files)")
 
 # ============================================================
 # MAIN ENTRY POINT
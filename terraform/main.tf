@@ -16,19 +16,19 @@ module "data_lake" {
       function_arn = aws_lambda_function.transformation_pipeline.arn
       events       = ["s3:ObjectCreated:*"]
       prefix       = "swob_raw/"
-      suffix       = ".json"
+      suffix       = ".ndjson.gz"
     },
     {
       function_arn = aws_lambda_function.transformation_pipeline.arn
       events       = ["s3:ObjectCreated:*"]
       prefix       = "hydrometric_raw/"
-      suffix       = ".json"
+      suffix       = ".ndjson.gz"
     },
     {
       function_arn = aws_lambda_function.transformation_pipeline.arn
       events       = ["s3:ObjectCreated:*"]
       prefix       = "climate_hourly_raw/"
-      suffix       = ".json"
+      suffix       = ".ndjson.gz"
     }
   ]
   